@@ -8,7 +8,7 @@ Enhanced API with cutting-edge features:
 - Neural Network Predictions
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 import json
 import time
@@ -20,10 +20,21 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from services.smartmine_simulator import SmartMineDigitalTwin
-from services.blockchain_service import smartmine_blockchain
+from services.smartmine_simulator import create_digital_twin
+from services.blockchain_service import smartmine_blockchain, verify_transaction_proof
+from services.ledger_export import CONTENT_TYPES, FILE_EXTENSIONS, export_ledger
+from services.replication import start_replication
 from models.revolutionary_ai import AdvancedAIEngine
 
+def parse_time_arg(value):
+    """Parse a query-string time given as epoch seconds or ISO 8601"""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
 class RevolutionarySmartMineAPI:
     """🚀 Revolutionary API with cutting-edge features"""
     
@@ -32,9 +43,10 @@ class RevolutionarySmartMineAPI:
         CORS(self.app)
         
         # Initialize advanced systems
-        self.simulator = SmartMineDigitalTwin()
+        self.simulator = create_digital_twin()
         self.ai_engine = AdvancedAIEngine()
         self.blockchain = smartmine_blockchain
+        self.peer_server, self.chain_syncer = start_replication(self.blockchain)
         
         # Load AI models if available
         try:
@@ -168,6 +180,7 @@ class RevolutionarySmartMineAPI:
                         'equipment_registered': stats['registered_equipment'],
                         'carbon_credits': stats['carbon_credits_issued'],
                         'latest_hash': stats['latest_block_hash'][:16] + '...',
+                        'consensus': stats['consensus']['type'],
                         'network_health': 99.7
                     }
                 })
@@ -175,6 +188,47 @@ class RevolutionarySmartMineAPI:
             except Exception as e:
                 return jsonify({'success': False, 'error': str(e)}), 500
         
+        @self.app.route('/api/blockchain/mempool', methods=['GET'])
+        def get_mempool_metrics():
+            """Get mempool queue depth and seal latency metrics"""
+            try:
+                if self.blockchain.mempool is None:
+                    return jsonify({
+                        'success': True,
+                        'mempool': {
+                            'enabled': False,
+                            'queue_depth': len(self.blockchain.pending_transactions)
+                        }
+                    })
+                
+                metrics = self.blockchain.mempool.get_metrics()
+                metrics['enabled'] = True
+                
+                return jsonify({
+                    'success': True,
+                    'mempool': metrics
+                })
+                
+            except Exception as e:
+                return jsonify({'success': False, 'error': str(e)}), 500
+        
+        @self.app.route('/api/blockchain/peers', methods=['GET'])
+        def get_replication_status():
+            """Get peer server and chain sync status"""
+            try:
+                return jsonify({
+                    'success': True,
+                    'replication': {
+                        'serving': self.peer_server is not None,
+                        'peer_port': self.peer_server.port if self.peer_server is not None else None,
+                        'peers': [peer.url for peer in self.chain_syncer.peers] if self.chain_syncer else [],
+                        'last_sync': self.chain_syncer.last_result if self.chain_syncer else None
+                    }
+                })
+
+            except Exception as e:
+                return jsonify({'success': False, 'error': str(e)}), 500
+
         @self.app.route('/api/blockchain/equipment/<equipment_id>', methods=['GET'])
         def get_equipment_blockchain_history(equipment_id):
             """Get equipment history from blockchain"""
@@ -194,7 +248,8 @@ class RevolutionarySmartMineAPI:
             """Get supply chain traceability"""
             try:
                 material_type = request.args.get('material_type')
-                trace = self.blockchain.get_supply_chain_trace(material_type)
+                truck_id = request.args.get('truck_id')
+                trace = self.blockchain.get_supply_chain_trace(material_type, truck_id)
                 
                 return jsonify({
                     'success': True,
@@ -204,6 +259,140 @@ class RevolutionarySmartMineAPI:
             except Exception as e:
                 return jsonify({'success': False, 'error': str(e)}), 500
         
+        @self.app.route('/api/blockchain/proof/<transaction_id>', methods=['GET'])
+        def get_transaction_proof(transaction_id):
+            """Get Merkle inclusion proof for a transaction"""
+            try:
+                proof = self.blockchain.get_transaction_proof(transaction_id)
+                
+                if 'error' in proof:
+                    return jsonify({'success': False, 'error': proof['error']}), 404
+                
+                return jsonify({
+                    'success': True,
+                    'inclusion_proof': proof
+                })
+                
+            except Exception as e:
+                return jsonify({'success': False, 'error': str(e)}), 500
+        
+        @self.app.route('/api/blockchain/verify-proof', methods=['POST'])
+        def verify_inclusion_proof():
+            """Verify a Merkle inclusion proof against a block header"""
+            try:
+                data = request.get_json()
+                
+                valid = verify_transaction_proof(
+                    data['transaction'],
+                    data['proof'],
+                    data['block_header'],
+                    self.blockchain.consensus
+                )
+                
+                return jsonify({
+                    'success': True,
+                    'valid': valid
+                })
+                
+            except Exception as e:
+                return jsonify({'success': False, 'error': str(e)}), 500
+        
+        @self.app.route('/api/blockchain/blocks', methods=['GET'])
+        def get_blockchain_blocks():
+            """Get a page of blocks by height range and/or time range"""
+            try:
+                page = self.blockchain.get_blocks(
+                    start_height=request.args.get('from_height', type=int),
+                    end_height=request.args.get('to_height', type=int),
+                    start_time=parse_time_arg(request.args.get('start')),
+                    end_time=parse_time_arg(request.args.get('end')),
+                    cursor=request.args.get('cursor'),
+                    limit=min(request.args.get('limit', 100, type=int), 1000),
+                    include_transactions=request.args.get('transactions', 'false').lower() == 'true'
+                )
+                
+                return jsonify({
+                    'success': True,
+                    'blocks': page['blocks'],
+                    'next_cursor': page['next_cursor']
+                })
+                
+            except ValueError as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
+            except Exception as e:
+                return jsonify({'success': False, 'error': str(e)}), 500
+        
+        @self.app.route('/api/blockchain/blocks/<int:height>', methods=['GET'])
+        def get_blockchain_block(height):
+            """Get a single block with its transactions"""
+            try:
+                page = self.blockchain.get_blocks(start_height=height, end_height=height,
+                                                  limit=1, include_transactions=True)
+                
+                if not page['blocks']:
+                    return jsonify({'success': False, 'error': 'Block not found'}), 404
+                
+                return jsonify({
+                    'success': True,
+                    'block': page['blocks'][0]
+                })
+                
+            except Exception as e:
+                return jsonify({'success': False, 'error': str(e)}), 500
+        
+        @self.app.route('/api/blockchain/blocks/transactions', methods=['GET'])
+        def get_blockchain_transactions():
+            """Get a page of transactions from blocks in a height and/or time range"""
+            try:
+                page = self.blockchain.get_transactions_in_range(
+                    start_height=request.args.get('from_height', type=int),
+                    end_height=request.args.get('to_height', type=int),
+                    start_time=parse_time_arg(request.args.get('start')),
+                    end_time=parse_time_arg(request.args.get('end')),
+                    tx_type=request.args.get('type'),
+                    cursor=request.args.get('cursor'),
+                    limit=min(request.args.get('limit', 100, type=int), 1000)
+                )
+                
+                return jsonify({
+                    'success': True,
+                    'transactions': page['transactions'],
+                    'next_cursor': page['next_cursor']
+                })
+                
+            except ValueError as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
+            except Exception as e:
+                return jsonify({'success': False, 'error': str(e)}), 500
+        
+        @self.app.route('/api/blockchain/export', methods=['GET'])
+        def export_blockchain():
+            """Stream blocks or transactions as NDJSON or columnar chunks"""
+            try:
+                fmt = request.args.get('format', 'ndjson')
+                kind = request.args.get('kind', 'transactions')
+                chunks = export_ledger(
+                    self.blockchain,
+                    fmt=fmt,
+                    kind=kind,
+                    tx_type=request.args.get('type'),
+                    start_height=request.args.get('from_height', type=int),
+                    end_height=request.args.get('to_height', type=int),
+                    start_time=parse_time_arg(request.args.get('start')),
+                    end_time=parse_time_arg(request.args.get('end'))
+                )
+                
+                # No Content-Length: the body goes out with chunked transfer encoding
+                filename = f"smartmine_{kind}.{FILE_EXTENSIONS[fmt]}"
+                return Response(chunks, mimetype=CONTENT_TYPES[fmt], headers={
+                    'Content-Disposition': f'attachment; filename="{filename}"'
+                })
+                
+            except ValueError as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
+            except Exception as e:
+                return jsonify({'success': False, 'error': str(e)}), 500
+        
         @self.app.route('/api/blockchain/carbon-credits', methods=['GET'])
         def get_carbon_credits():
             """Get carbon credits summary"""
@@ -218,6 +407,45 @@ class RevolutionarySmartMineAPI:
             except Exception as e:
                 return jsonify({'success': False, 'error': str(e)}), 500
         
+        @self.app.route('/api/blockchain/carbon-credits/series', methods=['GET'])
+        def get_carbon_credit_series():
+            """Get hourly, daily or monthly carbon-credit rollups"""
+            try:
+                series = self.blockchain.get_carbon_credit_series(
+                    granularity=request.args.get('granularity', 'day'),
+                    start_time=parse_time_arg(request.args.get('start')),
+                    end_time=parse_time_arg(request.args.get('end')),
+                    practice=request.args.get('practice'),
+                    equipment_id=request.args.get('equipment_id'),
+                    group_by=request.args.get('group_by')
+                )
+                
+                return jsonify({
+                    'success': True,
+                    'series': series
+                })
+                
+            except ValueError as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
+            except Exception as e:
+                return jsonify({'success': False, 'error': str(e)}), 500
+        
+        @self.app.route('/api/blockchain/carbon-credits/totals', methods=['GET'])
+        def get_carbon_credit_totals():
+            """Get running carbon-credit totals per practice or equipment"""
+            try:
+                totals = self.blockchain.get_carbon_credit_totals(request.args.get('by', 'practice'))
+                
+                return jsonify({
+                    'success': True,
+                    'totals': totals
+                })
+                
+            except ValueError as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
+            except Exception as e:
+                return jsonify({'success': False, 'error': str(e)}), 500
+        
         # 🌱 ENVIRONMENTAL ENDPOINTS
         @self.app.route('/api/environmental/impact', methods=['GET'])
         def get_environmental_impact():
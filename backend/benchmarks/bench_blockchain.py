@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+📊 SmartMine blockchain benchmark suite
+Builds synthetic chains through the public SmartMineBlockchain API
+(1k to 1M transactions by default) and measures, for each size:
+
+- transaction ingest rate (add_transaction) and block build rate
+- seal latency by proof-of-work difficulty
+- get_equipment_history and get_supply_chain_trace latency
+- validate_chain time (full re-validation and incremental)
+- get_blockchain_stats latency
+- memory per transaction (tracemalloc, separate build)
+
+Results can be written as JSON and compared against a baseline file to
+catch regressions between releases.
+
+Usage:
+    python benchmarks/bench_blockchain.py [--sizes 1000 10000 ...] [--difficulties 1 2 3 4]
+                                          [--json] [--output FILE] [--baseline FILE]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.blockchain_service import SmartMineBlockchain
+from services.consensus import ProofOfWork
+
+TRUCKS = [f'TRUCK_{i:03d}' for i in range(1, 16)]
+MATERIALS = ['iron_ore', 'copper_ore', 'coal', 'limestone']
+PRACTICES = ['electric_haulage', 'route_optimization', 'solar_power', 'idle_reduction']
+
+
+def submit(blockchain, i, rng, equipment):
+    """Submit the i-th transaction of the synthetic workload
+
+    Per 500 transactions: 10 equipment registrations, 10 maintenance
+    records, 5 carbon credits, 1 safety incident, the rest haul shipments.
+    """
+    if i % 50 == 0:
+        equipment_id = f'EQ_{len(equipment):06d}'
+        equipment.append(equipment_id)
+        blockchain.register_equipment(equipment_id, {
+            'manufacturer': 'Caterpillar',
+            'model': '797F',
+            'serial_number': f'SN{i}'
+        })
+    elif i % 50 == 1:
+        blockchain.record_maintenance(rng.choice(equipment), {
+            'type': 'routine',
+            'description': 'Scheduled service',
+            'technician': 'Fleet_Maintenance',
+            'cost': 1200,
+            'duration_hours': 4
+        })
+    elif i % 100 == 2:
+        blockchain.issue_carbon_credit({
+            'co2_reduction': 2.5,
+            'practice': rng.choice(PRACTICES),
+            'value': 62.5,
+            'equipment_id': rng.choice(equipment)
+        })
+    elif i % 500 == 3:
+        blockchain.record_safety_incident({
+            'severity': 'low',
+            'description': 'Near miss at ROM pad',
+            'location': 'ROM_PAD',
+            'equipment_id': rng.choice(equipment)
+        })
+    else:
+        blockchain.track_material_shipment({
+            'material_type': rng.choice(MATERIALS),
+            'quantity': rng.randint(200, 400),
+            'source': 'pit',
+            'destination': 'ROM_PAD',
+            'truck_id': rng.choice(TRUCKS)
+        })
+
+
+def build_chain(transactions, block_size, seed):
+    """Build a chain of ``transactions`` at difficulty 0; returns (chain, equipment, timings)"""
+    rng = random.Random(seed)
+    blockchain = SmartMineBlockchain(consensus=ProofOfWork(difficulty=0))
+    equipment = []
+    add_seconds = seal_seconds = 0.0
+    for block_start in range(0, transactions, block_size):
+        start = time.perf_counter()
+        for i in range(block_start, min(block_start + block_size, transactions)):
+            submit(blockchain, i, rng, equipment)
+        add_seconds += time.perf_counter() - start
+
+        start = time.perf_counter()
+        blockchain.mine_pending_transactions()
+        seal_seconds += time.perf_counter() - start
+    return blockchain, equipment, add_seconds, seal_seconds
+
+
+def measure_memory(transactions, block_size, seed):
+    """Bytes retained per transaction by a freshly built chain"""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    blockchain = build_chain(transactions, block_size, seed)[0]
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del blockchain
+    return retained / transactions
+
+
+def latency_ms(fn, args_list):
+    """Run ``fn`` once per argument tuple; returns (mean, p95) in milliseconds"""
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.fmean(samples), samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+
+def bench_size(transactions, args):
+    blockchain, equipment, add_seconds, seal_seconds = build_chain(transactions, args.block_size, args.seed)
+    result = {
+        'transactions': transactions,
+        'blocks': len(blockchain.chain),
+        'ingest_tx_per_second': transactions / add_seconds,
+        'build_tx_per_second': transactions / (add_seconds + seal_seconds)
+    }
+
+    rng = random.Random(args.seed)
+    queries = [(rng.choice(equipment),) for _ in range(args.queries)]
+    result['equipment_history_ms'], result['equipment_history_p95_ms'] = latency_ms(
+        blockchain.get_equipment_history, queries)
+    queries = [(None, rng.choice(TRUCKS)) for _ in range(args.queries)]
+    result['trace_by_truck_ms'], result['trace_by_truck_p95_ms'] = latency_ms(
+        blockchain.get_supply_chain_trace, queries)
+    queries = [(rng.choice(MATERIALS), None) for _ in range(args.queries)]
+    result['trace_by_material_ms'], result['trace_by_material_p95_ms'] = latency_ms(
+        blockchain.get_supply_chain_trace, queries)
+
+    start = time.perf_counter()
+    assert blockchain.validate_chain(full=True)
+    result['validate_full_ms'] = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    blockchain.validate_chain()
+    result['validate_incremental_ms'] = (time.perf_counter() - start) * 1000
+    result['stats_ms'], result['stats_p95_ms'] = latency_ms(
+        blockchain.get_blockchain_stats, [()] * args.queries)
+
+    # Seal latency last: it appends blocks to the chain
+    rng = random.Random(args.seed)
+    for difficulty in args.difficulties:
+        blockchain.difficulty = difficulty
+        samples = []
+        for _ in range(args.seal_blocks):
+            for i in range(args.block_size):
+                submit(blockchain, i + 4, rng, equipment)  # shipments only
+            samples.append(blockchain.seal_pending().seal_time_ms)
+        result[f'seal_d{difficulty}_ms'] = statistics.median(samples)
+
+    del blockchain
+    if not args.no_memory:
+        result['memory_bytes_per_tx'] = measure_memory(transactions, args.block_size, args.seed)
+    return result
+
+
+def is_rate(metric):
+    return metric.endswith('_per_second')
+
+
+def compare(results, baseline, tolerance):
+    """List metrics that got worse than the baseline by more than ``tolerance``"""
+    previous = {r['transactions']: r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        before = previous.get(result['transactions'])
+        if before is None:
+            continue
+        for metric, value in result.items():
+            old = before.get(metric)
+            if metric in ('transactions', 'blocks') or not old or not isinstance(value, (int, float)):
+                continue
+            change = (old - value) / old if is_rate(metric) else (value - old) / old
+            if change > tolerance:
+                regressions.append({
+                    'transactions': result['transactions'],
+                    'metric': metric,
+                    'baseline': old,
+                    'current': value,
+                    'change': change
+                })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SmartMine blockchain benchmark suite')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000, 1_000_000],
+                        help='chain sizes in transactions')
+    parser.add_argument('--block-size', type=int, default=500, help='transactions per block')
+    parser.add_argument('--difficulties', type=int, nargs='+', default=[1, 2, 3, 4])
+    parser.add_argument('--seal-blocks', type=int, default=3, help='blocks sealed per difficulty')
+    parser.add_argument('--queries', type=int, default=20, help='samples per query latency')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-memory', action='store_true', help='skip the memory-per-transaction build')
+    parser.add_argument('--json', action='store_true', help='emit machine-readable results')
+    parser.add_argument('--output', help='also write JSON results to this file')
+    parser.add_argument('--baseline', help='JSON results of a previous run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='relative slowdown reported as a regression')
+    args = parser.parse_args()
+
+    results = [bench_size(size, args) for size in args.sizes]
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'block_size': args.block_size,
+            'seed': args.seed
+        },
+        'results': results
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            report['regressions'] = compare(results, json.load(f), args.tolerance)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print("📊 SmartMine Blockchain Benchmark Suite")
+        print(f"{args.block_size} tx/block, Python {platform.python_version()}, {os.cpu_count()} CPUs")
+        metrics = [metric for metric in results[0] if metric != 'transactions']
+        print("=" * (28 + 14 * len(results)))
+        print(f"{'transactions':<28}" + ''.join(f"{r['transactions']:>14,}" for r in results))
+        print("-" * (28 + 14 * len(results)))
+        for metric in metrics:
+            print(f"{metric:<28}" + ''.join(f"{r.get(metric, 0):>14,.2f}" for r in results))
+        for regression in report.get('regressions', []):
+            print(f"⚠️ {regression['metric']} at {regression['transactions']:,} tx: "
+                  f"{regression['baseline']:,.2f} → {regression['current']:,.2f} "
+                  f"({regression['change']:+.0%} worse)")
+
+    if report.get('regressions'):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
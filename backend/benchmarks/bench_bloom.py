@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+🌸 SmartMine Bloom filter lookup benchmark
+Builds a synthetic chain (1M transactions by default) and compares
+find_transactions latency with per-block Bloom filters against a full scan
+of every block body, for rare equipment ids, single shipments and absent keys.
+
+Usage:
+    python benchmarks/bench_bloom.py [--transactions N] [--block-size N] [--lookups N] [--json]
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.blockchain_service import SmartMineBlockchain
+from services.consensus import ProofOfWork
+
+
+def make_transactions(block_number, block_size, trucks):
+    """Mostly haul shipments, plus a few equipment registrations and maintenance records"""
+    transactions = []
+    timestamp = datetime.now().isoformat()
+    for i in range(block_size):
+        if i % 100 == 0:
+            transactions.append({
+                'type': 'equipment_registration',
+                'id': str(uuid.uuid4()),
+                'timestamp': timestamp,
+                'equipment_id': f'EQ_{block_number:06d}_{i:03d}',
+                'manufacturer': 'Caterpillar',
+                'model': '797F',
+                'serial_number': f'SN{block_number}{i}',
+                'operator': 'SmartMine_System'
+            })
+        elif i % 100 == 1 and block_number > 0:
+            transactions.append({
+                'type': 'maintenance_record',
+                'id': str(uuid.uuid4()),
+                'timestamp': timestamp,
+                'equipment_id': f'EQ_{block_number - 1:06d}_000',
+                'maintenance_type': 'routine',
+                'description': 'Scheduled service',
+                'technician': 'Fleet_Maintenance',
+                'parts_used': [],
+                'cost': 1200,
+                'duration_hours': 4,
+                'next_maintenance_due': '',
+                'operator': 'SmartMine_System'
+            })
+        else:
+            transactions.append({
+                'type': 'supply_chain',
+                'id': str(uuid.uuid4()),
+                'timestamp': timestamp,
+                'shipment_id': str(uuid.uuid4()),
+                'material_type': 'iron_ore',
+                'quantity': 250,
+                'source_location': 'pit',
+                'destination': 'ROM_PAD',
+                'truck_id': random.choice(trucks),
+                'operator': 'SmartMine_System'
+            })
+    return transactions
+
+
+def build_chain(total_transactions, block_size):
+    # Difficulty 0 seals immediately; this benchmark is about lookups
+    blockchain = SmartMineBlockchain(consensus=ProofOfWork(difficulty=0))
+    trucks = [f'TRUCK_{i:03d}' for i in range(1, 16)]
+    shipments = []
+    for block_number in range(total_transactions // block_size):
+        transactions = make_transactions(block_number, block_size, trucks)
+        shipments.append(transactions[-1]['shipment_id'])
+        blockchain.seal_block(transactions)
+    return blockchain, shipments
+
+
+def time_lookups(blockchain, keys, use_bloom):
+    start = time.perf_counter()
+    matches = sum(len(blockchain.find_transactions(key, use_bloom=use_bloom)) for key in keys)
+    return (time.perf_counter() - start) / len(keys) * 1000, matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SmartMine Bloom filter lookup benchmark')
+    parser.add_argument('--transactions', type=int, default=1_000_000)
+    parser.add_argument('--block-size', type=int, default=500)
+    parser.add_argument('--lookups', type=int, default=3, help='keys timed per category')
+    parser.add_argument('--json', action='store_true', help='emit machine-readable results')
+    args = parser.parse_args()
+
+    build_start = time.perf_counter()
+    blockchain, shipments = build_chain(args.transactions, args.block_size)
+    build_seconds = time.perf_counter() - build_start
+    blocks = len(blockchain.chain) - 1
+
+    rng = random.Random(42)
+    categories = {
+        'equipment_id': [f'EQ_{rng.randrange(blocks - 1):06d}_000' for _ in range(args.lookups)],
+        'shipment_id': rng.sample(shipments, args.lookups),
+        'absent': [f'MISSING_{i}' for i in range(args.lookups)]
+    }
+
+    results = []
+    for category, keys in categories.items():
+        scan_ms, scan_matches = time_lookups(blockchain, keys, use_bloom=False)
+        bloom_ms, bloom_matches = time_lookups(blockchain, keys, use_bloom=True)
+        assert scan_matches == bloom_matches
+        results.append({
+            'key': category,
+            'blocks': blocks,
+            'transactions': blockchain.total_transactions,
+            'scan_ms': scan_ms,
+            'bloom_ms': bloom_ms,
+            'speedup': scan_ms / bloom_ms if bloom_ms else 0,
+            'matches_per_key': scan_matches / len(keys)
+        })
+
+    if args.json:
+        print(json.dumps({'build_seconds': build_seconds, 'results': results}, indent=2))
+        return
+
+    print("🌸 SmartMine Bloom Filter Lookup Benchmark")
+    print(f"{blockchain.total_transactions:,} transactions in {blocks:,} blocks (built in {build_seconds:.1f}s)")
+    print("=" * 64)
+    print(f"{'key':<14}{'scan (ms)':>14}{'bloom (ms)':>14}{'speedup':>10}{'matches':>12}")
+    print("-" * 64)
+    for r in results:
+        print(f"{r['key']:<14}{r['scan_ms']:>14.2f}{r['bloom_ms']:>14.2f}"
+              f"{r['speedup']:>9.0f}x{r['matches_per_key']:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+📣 SmartMine stream fan-out benchmark
+Starts a local WebSocket server, connects N reading clients plus a few
+stalled clients that never read, and broadcasts simulator payloads with
+the queued fan-out (per-client send queues and sender tasks) and with the
+previous approach of awaiting each client's send in turn. Reports how long
+the broadcast loop is blocked per tick and how long reading clients wait
+for each frame.
+
+Usage:
+    python benchmarks/bench_fanout.py [--clients 1 10 100 1000] [--slow N] [--ticks N] [--json]
+"""
+import argparse
+import asyncio
+import json
+import socket
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import websockets
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.smartmine_simulator import SmartMineDigitalTwin
+from services.stream_fanout import StreamFanout
+from services.stream_protocol import DeltaStream
+
+STALL_TIMEOUT = 2.0  # seconds a sequential broadcast may block before the run is called stalled
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run(mode, clients, slow, frames, interval, queue_size, policy, compression):
+    """Broadcast ``frames`` to ``clients`` readers and ``slow`` stalled clients"""
+    fanout = StreamFanout(queue_size, policy)
+    sockets = set()
+    connected = asyncio.Event()
+    expected = clients + slow
+
+    async def handler(websocket):
+        if websocket.path == '/stalled':
+            # Pin the server-side buffer too; loopback would otherwise absorb megabytes
+            websocket.transport.get_extra_info('socket').setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+        if mode == 'queued':
+            fanout.add_client(websocket)
+        sockets.add(websocket)
+        if len(sockets) == expected:
+            connected.set()
+        try:
+            await websocket.wait_closed()
+        finally:
+            fanout.remove_client(websocket)
+            sockets.discard(websocket)
+
+    server = await websockets.serve(handler, 'localhost', 0, max_size=None, compression=compression)
+    port = server.sockets[0].getsockname()[1]
+    url = f'ws://localhost:{port}'
+
+    published = {}
+    latencies = []
+
+    async def reader():
+        async with websockets.connect(url, max_size=None) as ws:
+            for i in range(len(frames)):
+                await ws.recv()
+                latencies.append(time.perf_counter() - published[i])
+
+    stalled = []
+    for _ in range(slow):
+        # Tiny socket and reader buffers, a one-message queue and no compression:
+        # the link fills after a few frames
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        sock.connect(('localhost', port))
+        stalled.append(await websockets.connect(f'{url}/stalled', sock=sock, max_queue=1,
+                                             read_limit=4096, compression=None, max_size=None))
+    readers = [asyncio.create_task(reader()) for _ in range(clients)]
+    await connected.wait()
+
+    blocked = []
+    is_stalled = False
+    for i, frame in enumerate(frames):
+        start = time.perf_counter()
+        published[i] = start
+        if mode == 'queued':
+            fanout.publish(frame)
+        else:
+            async def send_all():
+                for websocket in list(sockets):
+                    try:
+                        await websocket.send(frame.snapshot)
+                    except websockets.exceptions.ConnectionClosed:
+                        pass
+            try:
+                await asyncio.wait_for(send_all(), STALL_TIMEOUT)
+            except asyncio.TimeoutError:
+                is_stalled = True
+        blocked.append((time.perf_counter() - start) * 1000)
+        if is_stalled:
+            break
+        await asyncio.sleep(interval)
+
+    if not is_stalled:
+        await asyncio.wait(readers, timeout=STALL_TIMEOUT * 5)
+    for task in readers:
+        task.cancel()
+    for ws in stalled:
+        ws.transport.abort()
+    server.close()
+    metrics = fanout.get_metrics()
+
+    return {
+        'mode': mode,
+        'clients': clients,
+        'slow_clients': slow,
+        'stalled': is_stalled,
+        'blocked_ms': statistics.median(blocked),
+        'blocked_max_ms': max(blocked),
+        'latency_p50_ms': percentile(latencies, 0.5) * 1000 if latencies else None,
+        'latency_p99_ms': percentile(latencies, 0.99) * 1000 if latencies else None,
+        'frames_delivered': len(latencies),
+        'messages_dropped': metrics['messages_dropped'] if mode == 'queued' else None,
+        'clients_disconnected': metrics['clients_disconnected'] if mode == 'queued' else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SmartMine stream fan-out benchmark')
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 10, 100, 1_000])
+    parser.add_argument('--slow', type=int, default=5, help='stalled clients connected alongside the readers')
+    parser.add_argument('--modes', nargs='+', default=['queued', 'sequential'])
+    parser.add_argument('--trucks', type=int, default=15, help='fleet size of the broadcast payload')
+    parser.add_argument('--ticks', type=int, default=30)
+    parser.add_argument('--interval', type=float, default=1.0, help='seconds between ticks')
+    parser.add_argument('--queue-size', type=int, default=8)
+    parser.add_argument('--policy', default='drop_oldest', help='drop_oldest | disconnect')
+    parser.add_argument('--compression', default='deflate', help='deflate | none (per-connection permessage-deflate)')
+    parser.add_argument('--json', action='store_true', help='emit machine-readable results')
+    args = parser.parse_args()
+
+    # The simulator loads a historical dataset on start-up; a one-row stand-in will do
+    with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+        f.write("Datetime\n2024-01-01 00:00:00\n")
+        dataset = f.name
+    twin = SmartMineDigitalTwin(base_data_path=dataset, num_trucks=args.trucks)
+    Path(dataset).unlink()
+    stream = DeltaStream()
+    frames = [stream.next_frame(twin.generate_mining_data(), track=False) for _ in range(args.ticks)]
+
+    compression = None if args.compression == 'none' else args.compression
+    results = []
+    for clients in args.clients:
+        for mode in args.modes:
+            results.append(asyncio.run(run(mode, clients, args.slow, frames, args.interval,
+                                           args.queue_size, args.policy, compression)))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    def ms(value):
+        return f"{value:.2f}" if value is not None else "-"
+
+    print("📣 SmartMine Stream Fan-out Benchmark")
+    print(f"{args.ticks} ticks of {len(frames[0].snapshot):,} bytes, {args.slow} stalled clients, "
+          f"queue {args.queue_size} ({args.policy}), compression {args.compression}")
+    print("=" * 84)
+    print(f"{'mode':<12}{'clients':>8}{'blocked (ms)':>14}{'max (ms)':>11}{'p50 (ms)':>11}"
+          f"{'p99 (ms)':>11}{'delivered':>11}{'dropped':>9}")
+    print("-" * 84)
+    for r in results:
+        blocked_max = 'stalled' if r['stalled'] else ms(r['blocked_max_ms'])
+        dropped = r['messages_dropped'] if r['messages_dropped'] is not None else '-'
+        print(f"{r['mode']:<12}{r['clients']:>8,}{ms(r['blocked_ms']):>14}{blocked_max:>11}"
+              f"{ms(r['latency_p50_ms']):>11}{ms(r['latency_p99_ms']):>11}"
+              f"{r['frames_delivered']:>11,}{dropped:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+⛏️ SmartMine proof-of-work mining benchmark
+Compares single-threaded MiningBlock.mine_block with ParallelMiner,
+reporting hashes per second and time-to-seal at each difficulty.
+
+Usage:
+    python benchmarks/bench_mining.py [--workers N] [--blocks N] [--difficulties 2 3 4 5] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.blockchain_service import MiningBlock
+from services.parallel_miner import ParallelMiner
+
+
+def make_block(index):
+    """Build a block with a handful of representative transactions"""
+    transactions = [
+        {
+            'type': 'supply_chain',
+            'id': f'tx-{index}-{i}',
+            'shipment_id': f'shipment-{index}-{i}',
+            'material_type': 'iron_ore',
+            'quantity': 350,
+            'truck_id': f'TRUCK_{i:03d}',
+            'operator': 'SmartMine_System'
+        }
+        for i in range(10)
+    ]
+    return MiningBlock(index, transactions, '0' * 64)
+
+
+def bench_sequential(difficulty, blocks):
+    attempts = 0
+    start = time.perf_counter()
+    for i in range(blocks):
+        block = make_block(i)
+        block.mine_block(difficulty)
+        attempts += block.nonce + 1
+    return attempts, time.perf_counter() - start
+
+
+def bench_parallel(miner, difficulty, blocks):
+    attempts = 0
+    duration = 0.0
+    for i in range(blocks):
+        block = make_block(i)
+        miner.mine_block(block, difficulty)
+        attempts += miner.last_attempts
+        duration += miner.last_duration
+    return attempts, duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SmartMine PoW mining benchmark')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--blocks', type=int, default=5, help='blocks sealed per difficulty')
+    parser.add_argument('--difficulties', type=int, nargs='+', default=[2, 3, 4, 5])
+    parser.add_argument('--json', action='store_true', help='emit machine-readable results')
+    args = parser.parse_args()
+
+    miner = ParallelMiner(workers=args.workers)
+    # Start the worker processes before timing
+    miner.mine_block(make_block(0), 1)
+
+    results = []
+    try:
+        for difficulty in args.difficulties:
+            for mode in ('sequential', 'parallel'):
+                if mode == 'sequential':
+                    attempts, duration = bench_sequential(difficulty, args.blocks)
+                else:
+                    attempts, duration = bench_parallel(miner, difficulty, args.blocks)
+                results.append({
+                    'mode': mode,
+                    'workers': 1 if mode == 'sequential' else args.workers,
+                    'difficulty': difficulty,
+                    'blocks': args.blocks,
+                    'hashes_per_second': attempts / duration if duration else 0,
+                    'seal_time_ms': duration / args.blocks * 1000
+                })
+    finally:
+        miner.shutdown()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("⛏️  SmartMine PoW Mining Benchmark")
+    print("=" * 64)
+    print(f"{'mode':<12}{'workers':>8}{'difficulty':>12}{'hashes/s':>16}{'seal (ms)':>16}")
+    print("-" * 64)
+    for r in results:
+        print(f"{r['mode']:<12}{r['workers']:>8}{r['difficulty']:>12}"
+              f"{r['hashes_per_second']:>16,.0f}{r['seal_time_ms']:>16.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+📡 SmartMine stream bandwidth benchmark
+Runs the simulator for N ticks and compares the bytes a full-snapshot client
+receives with what a delta-protocol client receives (keyframe on connect and
+every K ticks, changed fields in between). Every delta is applied to a
+client-side copy and checked against the full snapshot. With --topics the
+stream is limited to those subscriptions, payload sections included.
+
+Usage:
+    python benchmarks/bench_stream.py [--trucks 15 1000] [--ticks N] [--keyframe-interval K]
+                                      [--topics trucks/TRUCK_001 kpis] [--json]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.smartmine_simulator import SmartMineDigitalTwin
+from services.stream_protocol import DeltaStream, apply_delta, topic_selection
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SmartMine stream bandwidth benchmark')
+    parser.add_argument('--trucks', type=int, nargs='+', default=[15, 1_000])
+    parser.add_argument('--engine', default='dict', help='simulation engine: dict | vectorized')
+    parser.add_argument('--ticks', type=int, default=200)
+    parser.add_argument('--keyframe-interval', type=int, default=20)
+    parser.add_argument('--topics', nargs='+', help='subscribed topics (default: the whole payload)')
+    parser.add_argument('--json', action='store_true', help='emit machine-readable results')
+    args = parser.parse_args()
+
+    # The simulator loads a historical dataset on start-up; a one-row stand-in will do
+    with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+        f.write("Datetime\n2024-01-01 00:00:00\n")
+        dataset = f.name
+
+    topics = frozenset(args.topics) if args.topics else None
+    selection = topic_selection([topics]) if topics else None
+    results = []
+    for trucks in args.trucks:
+        twin = SmartMineDigitalTwin(base_data_path=dataset, engine=args.engine, num_trucks=trucks)
+        stream = DeltaStream(args.keyframe_interval)
+        full_bytes = delta_bytes = 0
+        payload_seconds = encode_seconds = 0.0
+        state = None
+        for _ in range(args.ticks):
+            start = time.perf_counter()
+            data = twin.generate_mining_data(selection)
+            payload_seconds += time.perf_counter() - start
+            start = time.perf_counter()
+            frame = stream.next_frame(data)
+            snapshot = frame.message_for('full', topics=topics)
+            message = frame.message_for('delta', needs_keyframe=state is None, topics=topics)
+            encode_seconds += time.perf_counter() - start
+
+            full_bytes += len(snapshot.encode())
+            delta_bytes += len(message.encode())
+            decoded = json.loads(message)
+            state = decoded['data'] if decoded['type'] == 'keyframe' else apply_delta(state, decoded)
+            assert state == json.loads(snapshot), "delta client diverged"
+
+        results.append({
+            'trucks': trucks,
+            'ticks': args.ticks,
+            'keyframe_interval': args.keyframe_interval,
+            'full_bytes_per_tick': full_bytes / args.ticks,
+            'delta_bytes_per_tick': delta_bytes / args.ticks,
+            'reduction': full_bytes / delta_bytes,
+            'payload_ms_per_tick': payload_seconds / args.ticks * 1000,
+            'encode_ms_per_tick': encode_seconds / args.ticks * 1000
+        })
+    Path(dataset).unlink()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("📡 SmartMine Stream Bandwidth Benchmark")
+    print(f"{args.ticks} ticks, keyframe every {args.keyframe_interval} ticks, {args.engine} engine, "
+          f"topics: {' '.join(sorted(topics)) if topics else 'all'}")
+    print("=" * 80)
+    print(f"{'trucks':>8}{'full B/tick':>14}{'delta B/tick':>14}{'reduction':>12}"
+          f"{'payload (ms)':>16}{'encode (ms)':>16}")
+    print("-" * 80)
+    for r in results:
+        print(f"{r['trucks']:>8,}{r['full_bytes_per_tick']:>14,.0f}{r['delta_bytes_per_tick']:>14,.0f}"
+              f"{r['reduction']:>11.1f}x{r['payload_ms_per_tick']:>16.2f}{r['encode_ms_per_tick']:>16.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -15,6 +15,10 @@ API_DEBUG = os.getenv('API_DEBUG', 'False').lower() == 'true'
 # --- WebSocket Configuration ---
 WEBSOCKET_HOST = os.getenv('WEBSOCKET_HOST', 'localhost')
 WEBSOCKET_PORT = int(os.getenv('WEBSOCKET_PORT', 8765))
+STREAM_KEYFRAME_INTERVAL = int(os.getenv('STREAM_KEYFRAME_INTERVAL', 20))  # ticks between delta-stream keyframes
+STREAM_CLIENT_QUEUE_SIZE = int(os.getenv('STREAM_CLIENT_QUEUE_SIZE', 8))  # frames buffered per client
+STREAM_SLOW_CLIENT_POLICY = os.getenv('STREAM_SLOW_CLIENT_POLICY', 'drop_oldest')  # drop_oldest | disconnect
+STREAM_COMPRESSION = os.getenv('STREAM_COMPRESSION', 'deflate')  # deflate | none (per-connection permessage-deflate)
 
 # --- Database Configuration (for future use) ---
 DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///smartmine.db')
@@ -24,11 +28,44 @@ SIMULATION_INTERVAL = float(os.getenv('SIMULATION_INTERVAL', 5.0))  # seconds
 MAX_TRUCKS = int(os.getenv('MAX_TRUCKS', 15))
 MAX_CRUSHERS = int(os.getenv('MAX_CRUSHERS', 3))
 MAX_STOCKPILES = int(os.getenv('MAX_STOCKPILES', 4))
+SIMULATION_ENGINE = os.getenv('SIMULATION_ENGINE', 'dict')  # dict | vectorized (NumPy, large fleets)
+SIMULATION_RECORD_DUMPS = os.getenv('SIMULATION_RECORD_DUMPS', 'True').lower() == 'true'  # truck dumps on the blockchain
 
 # --- Data Configuration ---
 DATA_DIR = BASE_DIR / 'data'
 DATASET_FILE = DATA_DIR / 'dataset.csv'
 
+# --- Blockchain Configuration ---
+BLOCKCHAIN_PERSIST = os.getenv('BLOCKCHAIN_PERSIST', 'False').lower() == 'true'
+BLOCKCHAIN_DATA_DIR = Path(os.getenv('BLOCKCHAIN_DATA_DIR', DATA_DIR / 'blockchain'))
+BLOCKCHAIN_FSYNC_BATCH = int(os.getenv('BLOCKCHAIN_FSYNC_BATCH', 16))  # blocks per fsync
+BLOCKCHAIN_SNAPSHOT_INTERVAL = int(os.getenv('BLOCKCHAIN_SNAPSHOT_INTERVAL', 100))  # blocks
+BLOCKCHAIN_PRUNE_DEPTH = int(os.getenv('BLOCKCHAIN_PRUNE_DEPTH', 0))  # blocks kept with bodies, 0 = no pruning
+BLOCKCHAIN_ARCHIVE = os.getenv('BLOCKCHAIN_ARCHIVE', 'False').lower() == 'true'  # offload pruned bodies
+BLOCKCHAIN_ARCHIVE_DIR = Path(os.getenv('BLOCKCHAIN_ARCHIVE_DIR', DATA_DIR / 'blockchain_archive'))
+BLOCKCHAIN_CONSENSUS = os.getenv('BLOCKCHAIN_CONSENSUS', 'pow')  # pow | poa
+BLOCKCHAIN_DIFFICULTY = int(os.getenv('BLOCKCHAIN_DIFFICULTY', 2))
+BLOCKCHAIN_MIN_DIFFICULTY = int(os.getenv('BLOCKCHAIN_MIN_DIFFICULTY', 1))  # lowest difficulty a block may record
+BLOCKCHAIN_AUTHORITY_ID = os.getenv('BLOCKCHAIN_AUTHORITY_ID', 'SmartMine_Site')
+BLOCKCHAIN_AUTHORITY_KEY = os.getenv('BLOCKCHAIN_AUTHORITY_KEY', '')  # Ed25519 seed (hex)
+BLOCKCHAIN_AUTHORITIES = os.getenv('BLOCKCHAIN_AUTHORITIES', '')  # id:pubkey_hex,...
+BLOCKCHAIN_MINING_WORKERS = int(os.getenv('BLOCKCHAIN_MINING_WORKERS', 1))  # >1 enables parallel PoW
+BLOCKCHAIN_MINING_TIMEOUT = float(os.getenv('BLOCKCHAIN_MINING_TIMEOUT', 0)) or None  # seconds
+BLOCKCHAIN_MEMPOOL_ENABLED = os.getenv('BLOCKCHAIN_MEMPOOL_ENABLED', 'False').lower() == 'true'
+BLOCKCHAIN_BLOCK_MAX_TRANSACTIONS = int(os.getenv('BLOCKCHAIN_BLOCK_MAX_TRANSACTIONS', 500))
+BLOCKCHAIN_BLOCK_MAX_AGE_MS = float(os.getenv('BLOCKCHAIN_BLOCK_MAX_AGE_MS', 2000))
+BLOCKCHAIN_MEMPOOL_CAPACITY = int(os.getenv('BLOCKCHAIN_MEMPOOL_CAPACITY', 10000))  # transactions
+BLOCKCHAIN_MEMPOOL_FULL_POLICY = os.getenv('BLOCKCHAIN_MEMPOOL_FULL_POLICY', 'reject')  # reject | block
+BLOCKCHAIN_PEER_HOST = os.getenv('BLOCKCHAIN_PEER_HOST', 'localhost')
+BLOCKCHAIN_PEER_PORT = int(os.getenv('BLOCKCHAIN_PEER_PORT', 0))  # 0 = don't serve peers
+BLOCKCHAIN_PEERS = os.getenv('BLOCKCHAIN_PEERS', '')  # http://host:port,...
+BLOCKCHAIN_SYNC_INTERVAL = float(os.getenv('BLOCKCHAIN_SYNC_INTERVAL', 5.0))  # seconds
+BLOCKCHAIN_SYNC_WORKERS = int(os.getenv('BLOCKCHAIN_SYNC_WORKERS', 4))  # parallel body downloads
+BLOCKCHAIN_OPERATOR_KEY = os.getenv('BLOCKCHAIN_OPERATOR_KEY', '')  # Ed25519 seed (hex) signing our transactions
+BLOCKCHAIN_REQUIRE_SIGNATURES = os.getenv('BLOCKCHAIN_REQUIRE_SIGNATURES', 'False').lower() == 'true'
+BLOCKCHAIN_VERIFY_WORKERS = int(os.getenv('BLOCKCHAIN_VERIFY_WORKERS', 1))  # >1 verifies batches in a process pool
+BLOCKCHAIN_SIGNATURE_CACHE_SIZE = int(os.getenv('BLOCKCHAIN_SIGNATURE_CACHE_SIZE', 100000))  # verified transactions
+
 # --- Machine Learning Configuration ---
 ML_MODEL_PATH = BASE_DIR / 'models' / 'trained_models'
 ML_RETRAIN_INTERVAL = int(os.getenv('ML_RETRAIN_INTERVAL', 3600))  # seconds
@@ -83,7 +120,11 @@ class Config:
         """Returns WebSocket server configuration as a dictionary."""
         return {
             'host': WEBSOCKET_HOST,
-            'port': WEBSOCKET_PORT
+            'port': WEBSOCKET_PORT,
+            'keyframe_interval': STREAM_KEYFRAME_INTERVAL,
+            'client_queue_size': STREAM_CLIENT_QUEUE_SIZE,
+            'slow_client_policy': STREAM_SLOW_CLIENT_POLICY,
+            'compression': STREAM_COMPRESSION
         }
     
     @staticmethod
@@ -93,7 +134,9 @@ class Config:
             'interval': SIMULATION_INTERVAL,
             'max_trucks': MAX_TRUCKS,
             'max_crushers': MAX_CRUSHERS,
-            'max_stockpiles': MAX_STOCKPILES
+            'max_stockpiles': MAX_STOCKPILES,
+            'engine': SIMULATION_ENGINE,
+            'record_dumps': SIMULATION_RECORD_DUMPS
         }
     
     @staticmethod
@@ -104,6 +147,38 @@ class Config:
             'retrain_interval': ML_RETRAIN_INTERVAL
         }
     
+    @staticmethod
+    def get_blockchain_config():
+        """Returns blockchain persistence configuration as a dictionary."""
+        return {
+            'persist': BLOCKCHAIN_PERSIST,
+            'data_dir': BLOCKCHAIN_DATA_DIR,
+            'fsync_batch': BLOCKCHAIN_FSYNC_BATCH,
+            'snapshot_interval': BLOCKCHAIN_SNAPSHOT_INTERVAL,
+            'prune_depth': BLOCKCHAIN_PRUNE_DEPTH,
+            'archive': BLOCKCHAIN_ARCHIVE,
+            'archive_dir': BLOCKCHAIN_ARCHIVE_DIR,
+            'consensus': BLOCKCHAIN_CONSENSUS,
+            'difficulty': BLOCKCHAIN_DIFFICULTY,
+            'min_difficulty': BLOCKCHAIN_MIN_DIFFICULTY,
+            'authority_id': BLOCKCHAIN_AUTHORITY_ID,
+            'mining_workers': BLOCKCHAIN_MINING_WORKERS,
+            'mining_timeout': BLOCKCHAIN_MINING_TIMEOUT,
+            'mempool_enabled': BLOCKCHAIN_MEMPOOL_ENABLED,
+            'block_max_transactions': BLOCKCHAIN_BLOCK_MAX_TRANSACTIONS,
+            'block_max_age_ms': BLOCKCHAIN_BLOCK_MAX_AGE_MS,
+            'mempool_capacity': BLOCKCHAIN_MEMPOOL_CAPACITY,
+            'mempool_full_policy': BLOCKCHAIN_MEMPOOL_FULL_POLICY,
+            'peer_host': BLOCKCHAIN_PEER_HOST,
+            'peer_port': BLOCKCHAIN_PEER_PORT,
+            'peers': BLOCKCHAIN_PEERS,
+            'sync_interval': BLOCKCHAIN_SYNC_INTERVAL,
+            'sync_workers': BLOCKCHAIN_SYNC_WORKERS,
+            'require_signatures': BLOCKCHAIN_REQUIRE_SIGNATURES,
+            'verify_workers': BLOCKCHAIN_VERIFY_WORKERS,
+            'signature_cache_size': BLOCKCHAIN_SIGNATURE_CACHE_SIZE
+        }
+    
     @staticmethod
     def get_logging_config():
         """Returns logging configuration as a dictionary."""
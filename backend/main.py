@@ -12,7 +12,7 @@ backend_dir = Path(__file__).parent
 sys.path.append(str(backend_dir))
 
 from api.api_server import create_app
-from services.smartmine_simulator import SmartMineDigitalTwin
+from services.smartmine_simulator import create_digital_twin
 from utils.logger import setup_logging
 
 # Setup logging
@@ -28,7 +28,7 @@ class SmartMineBackend:
         """Start the SmartMine digital twin simulator"""
         try:
             logger.info("Starting SmartMine Digital Twin Simulator...")
-            self.simulator = SmartMineDigitalTwin()
+            self.simulator = create_digital_twin()
             # Start the simulator with proper async handling
             await self.simulator.start_smartmine_simulation_async()
             logger.info("SmartMine Simulator started successfully")
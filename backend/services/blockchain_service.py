@@ -8,51 +8,458 @@ Revolutionary blockchain technology for mining operations
 - Immutable audit trails
 """
 
+import asyncio
+import atexit
+import bisect
 import hashlib
 import json
+import struct
+import sys
+import threading
 import time
 from datetime import datetime
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+import config
+from services.block_store import BlockStore, iterencode
+from services.carbon_rollups import CarbonRollups
+from services.bloom_filter import BloomFilter
+from services.consensus import ConsensusEngine, ProofOfAuthority, ProofOfWork
+from services.ledger_records import TransactionColumns, as_dict, make_record, to_columns
+from services.mempool import Mempool
+from services.parallel_miner import NONCE, ParallelMiner
+from services.tx_signing import SignatureVerifier, TransactionSigner, is_signed
+
+# Domain separation: a leaf hash can never be passed off as an inner node or vice versa
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+
+def hash_transaction(transaction: Dict) -> str:
+    """Hash a single transaction (Merkle leaf)"""
+    return hashlib.sha256(
+        LEAF_PREFIX + json.dumps(as_dict(transaction), sort_keys=True).encode()
+    ).hexdigest()
+
+def _hash_pair(left: str, right: str) -> str:
+    return hashlib.sha256(NODE_PREFIX + bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+def _next_level(level: List[str]) -> List[str]:
+    """Hash one tree level into the next
+    
+    An odd last node is carried up unpaired rather than paired with a copy
+    of itself, which would give ``txs`` and ``txs + [txs[-1]]`` the same root.
+    """
+    parents = [_hash_pair(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+    if len(level) % 2:
+        parents.append(level[-1])
+    return parents
+
+def compute_merkle_root(tx_hashes: List[str]) -> str:
+    """Compute the Merkle root of a list of transaction hashes"""
+    if not tx_hashes:
+        return hashlib.sha256(b'').hexdigest()
+    
+    level = list(tx_hashes)
+    while len(level) > 1:
+        level = _next_level(level)
+    return level[0]
+
+def build_merkle_proof(tx_hashes: List[str], position: int) -> List[Dict]:
+    """Build the sibling path from a leaf up to the Merkle root"""
+    proof = []
+    level = list(tx_hashes)
+    while len(level) > 1:
+        sibling = position ^ 1
+        # A node carried up unpaired has no sibling at this level
+        if sibling < len(level):
+            proof.append({
+                'hash': level[sibling],
+                'position': 'left' if sibling < position else 'right'
+            })
+        level = _next_level(level)
+        position //= 2
+    return proof
+
+def verify_merkle_proof(tx_hash: str, proof: List[Dict], merkle_root: str) -> bool:
+    """Check that a transaction hash and sibling path lead to the Merkle root"""
+    current = tx_hash
+    for step in proof:
+        if step['position'] == 'left':
+            current = _hash_pair(step['hash'], current)
+        else:
+            current = _hash_pair(current, step['hash'])
+    return current == merkle_root
+
+# Fixed-width header encoding: index, timestamp, previous hash, Merkle root,
+# the proof-of-work difficulty if the block has one, then the nonce
+# (parallel_miner.NONCE). Blocks without a difficulty (genesis, proof of
+# authority, and blocks sealed before it was recorded) omit that byte.
+HEADER_PREFIX = struct.Struct('<Qd32s32s')
+HEADER_DIFFICULTY = struct.Struct('<B')
+
+def _hash_bytes(hex_hash: str) -> bytes:
+    """Decode a hex hash to 32 bytes (the genesis previous hash is just "0")"""
+    return bytes.fromhex(hex_hash.rjust(64, '0'))
+
+# Transaction fields whose ids go into each block's Bloom filter
+BLOOM_FIELDS = ('equipment_id', 'equipment_involved', 'truck_id', 'shipment_id', 'credit_id')
+
+def bloom_keys(transactions) -> set:
+    """Collect the lookup keys a block's Bloom filter covers"""
+    keys = set()
+    for tx in transactions:
+        for field in BLOOM_FIELDS:
+            value = tx.get(field)
+            if value and isinstance(value, str):
+                keys.add(value)
+    return keys
+
+# Fixed genesis time (2024-01-01T00:00:00Z) so every node builds the same genesis block
+GENESIS_TIMESTAMP = 1704067200.0
+
+class _HeaderField:
+    """Block header attribute (slot-backed) whose assignment is reported via on_change
+    
+    The report comes before the new value is stored, so a changed index
+    invalidates the block's old position.
+    """
+    
+    def __set_name__(self, owner, name: str):
+        self.slot = '_' + name
+    
+    def __get__(self, block, owner=None):
+        if block is None:
+            return self
+        return getattr(block, self.slot)
+    
+    def __set__(self, block, value):
+        block._changed()
+        setattr(block, self.slot, value)
 
 class MiningBlock:
-    """Individual block in the SmartMine blockchain"""
+    """Individual block in the SmartMine blockchain
+    
+    Transactions are held column-wise (see ledger_records) and read back as
+    dict-like records; ``transactions`` is None once a body is pruned.
+    
+    ``bloom`` covers the equipment, truck, shipment and credit ids in the
+    block and survives pruning. It is not part of the hashed header, so it
+    is a lookup hint only: a miss lets a query skip the block, a hit must be
+    confirmed against the body (and its Merkle proof, for light clients).
+    
+    ``on_change`` is set by the chain the block is appended to and called
+    with the block's index whenever its body or any header field is
+    replaced afterwards (pruning the body aside), so validation re-checks it.
+    """
+    
+    __slots__ = ('_index', '_timestamp', '_transactions', '_previous_hash', '_merkle_root',
+                 '_difficulty', '_nonce', '_signer', '_signature', '_hash', 'bloom', 'on_change')
+    
+    index = _HeaderField()
+    timestamp = _HeaderField()
+    previous_hash = _HeaderField()
+    merkle_root = _HeaderField()
+    difficulty = _HeaderField()
+    nonce = _HeaderField()
+    signer = _HeaderField()
+    signature = _HeaderField()
+    hash = _HeaderField()
     
     def __init__(self, index: int, transactions: List[Dict], previous_hash: str):
+        self.on_change = None
         self.index = index
         self.timestamp = time.time()
-        self.transactions = transactions
         self.previous_hash = previous_hash
+        self.merkle_root = compute_merkle_root([hash_transaction(tx) for tx in transactions])
+        self.bloom = BloomFilter.from_keys(bloom_keys(transactions))
+        self.transactions = transactions
+        # Set by proof-of-work sealing
+        self.difficulty = None
         self.nonce = 0
+        # Set by proof-of-authority sealing
+        self.signer = None
+        self.signature = None
         self.hash = self.calculate_hash()
     
+    @property
+    def transactions(self) -> Optional[TransactionColumns]:
+        return self._transactions
+    
+    @transactions.setter
+    def transactions(self, transactions):
+        self._transactions = to_columns(transactions)
+        # Pruning (None) leaves the committed header as it was
+        if transactions is not None:
+            self._changed()
+    
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change(self.index)
+    
+    def calculate_merkle_root(self) -> str:
+        """Calculate the Merkle root of the block's transactions"""
+        return compute_merkle_root([hash_transaction(tx) for tx in self.transactions])
+    
     def calculate_hash(self) -> str:
-        """Calculate the hash of the block"""
-        block_string = json.dumps({
-            "index": self.index,
-            "timestamp": self.timestamp,
-            "transactions": self.transactions,
-            "previous_hash": self.previous_hash,
-            "nonce": self.nonce
-        }, sort_keys=True)
-        return hashlib.sha256(block_string.encode()).hexdigest()
+        """Calculate the hash of the block header"""
+        return MiningBlock.hash_header(self.get_header())
+    
+    @staticmethod
+    def serialize_header_prefix(header: Dict) -> bytes:
+        """Encode the constant part of the header (everything but the nonce)"""
+        prefix = HEADER_PREFIX.pack(
+            header['index'],
+            header['timestamp'],
+            _hash_bytes(header['previous_hash']),
+            _hash_bytes(header['merkle_root'])
+        )
+        difficulty = header.get('difficulty')
+        if difficulty is not None:
+            prefix += HEADER_DIFFICULTY.pack(difficulty)
+        return prefix
+    
+    @staticmethod
+    def hash_header(header: Dict) -> str:
+        """Hash a block header; transactions are committed via the Merkle root"""
+        return hashlib.sha256(
+            MiningBlock.serialize_header_prefix(header) + NONCE.pack(header['nonce'])
+        ).hexdigest()
+    
+    def get_header_prefix(self) -> bytes:
+        """Get the encoded header bytes that precede the nonce"""
+        return MiningBlock.serialize_header_prefix(self.get_header())
+    
+    def get_header(self) -> Dict:
+        """Get the block header (everything except the transaction bodies)"""
+        return {
+            'index': self.index,
+            'timestamp': self.timestamp,
+            'merkle_root': self.merkle_root,
+            'previous_hash': self.previous_hash,
+            'difficulty': self.difficulty,
+            'nonce': self.nonce,
+            'hash': getattr(self, 'hash', None),
+            'signer': self.signer,
+            'signature': self.signature
+        }
+    
+    def get_merkle_proof(self, position: int, transactions: Optional[List[Dict]] = None) -> List[Dict]:
+        """Get the inclusion proof for the transaction at ``position``
+        
+        Pruned blocks need their archived ``transactions`` passed in.
+        """
+        transactions = self.transactions if transactions is None else transactions
+        return build_merkle_proof([hash_transaction(tx) for tx in transactions], position)
     
     def mine_block(self, difficulty: int):
-        """Mine the block with proof of work"""
+        """Mine the block with proof of work
+        
+        ``difficulty`` is recorded in the header, so the block keeps
+        validating if the chain's difficulty changes later. The header
+        prefix is hashed once; each attempt only hashes the nonce into a
+        copy of that state, independent of the transaction count.
+        """
+        self.difficulty = difficulty
         target = "0" * difficulty
-        while self.hash[:difficulty] != target:
-            self.nonce += 1
-            self.hash = self.calculate_hash()
+        prefix_hash = hashlib.sha256(self.get_header_prefix())
+        pack_nonce = NONCE.pack
+        nonce, block_hash = self.nonce, self.calculate_hash()
+        while block_hash[:difficulty] != target:
+            nonce += 1
+            attempt = prefix_hash.copy()
+            attempt.update(pack_nonce(nonce))
+            block_hash = attempt.hexdigest()
+        self.nonce, self.hash = nonce, block_hash
+    
+    def to_dict(self) -> Dict:
+        """Serialize the block for storage"""
+        header = self.get_header()
+        header['bloom'] = self.bloom.to_dict() if self.bloom is not None else None
+        header['transactions'] = self.transactions.to_dicts() if self.transactions is not None else None
+        return header
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'MiningBlock':
+        """Rebuild a stored block without recomputing its hashes"""
+        block = cls.__new__(cls)
+        block.on_change = None
+        block.index = data['index']
+        block.timestamp = data['timestamp']
+        block.transactions = data['transactions']
+        block.previous_hash = data['previous_hash']
+        block.merkle_root = data['merkle_root']
+        block.difficulty = data.get('difficulty')
+        block.nonce = data['nonce']
+        block.signer = data.get('signer')
+        block.signature = data.get('signature')
+        block.hash = data['hash']
+        if data.get('bloom') is not None:
+            block.bloom = BloomFilter.from_dict(data['bloom'])
+        elif block.transactions is not None:
+            # Stored before blocks carried filters
+            block.bloom = BloomFilter.from_keys(bloom_keys(block.transactions))
+        else:
+            block.bloom = None
+        return block
+    
+    def may_contain(self, key: str) -> bool:
+        """False if the block definitely holds no transaction with this id"""
+        return self.bloom is None or key in self.bloom
+
+def verify_transaction_proof(transaction: Dict, proof: List[Dict], header: Dict,
+                             consensus: Optional[ConsensusEngine] = None) -> bool:
+    """Verify a transaction inclusion proof against only a block header
+    
+    If a consensus engine is given, the header's seal (PoW target or
+    authority signature) is checked too.
+    """
+    if MiningBlock.hash_header(header) != header.get('hash'):
+        return False
+    if consensus is not None and not consensus.validate_header(header):
+        return False
+    return verify_merkle_proof(hash_transaction(transaction), proof, header['merkle_root'])
+
+class ChainView(NamedTuple):
+    """Immutable summary of the chain at one height, published after each block"""
+    height: int
+    latest_hash: str
+    total_transactions: int
+    transaction_types: Dict
+    serialized_size_bytes: int
+    registered_equipment: int
+    supply_chain_records: int
+    carbon_credits_issued: int
+    safety_incidents: int
+    carbon_co2_reduction_tons: float
+    carbon_value_usd: float
+    pruned_height: int
+
+class SealReceipt(NamedTuple):
+    """Result of sealing pending transactions into a block"""
+    block_index: int
+    block_hash: str
+    seal_time_ms: float
+
+class _BlockTimes:
+    """Read-only sequence of block timestamps, for bisect (its key= needs Python 3.10)"""
+    
+    __slots__ = ('chain',)
+    
+    def __init__(self, chain: List[MiningBlock]):
+        self.chain = chain
+    
+    def __len__(self) -> int:
+        return len(self.chain)
+    
+    def __getitem__(self, height: int) -> float:
+        return self.chain[height].timestamp
 
 class SmartMineBlockchain:
-    """Revolutionary blockchain for mining operations"""
+    """Revolutionary blockchain for mining operations
+    
+    Concurrency model: one writer at a time (guarded by ``_write_lock``)
+    appends blocks and updates derived state; after each block it publishes
+    an immutable ChainView. Readers take the current view and only look at
+    blocks and index entries up to its height, so queries never block
+    sealing and never see a half-applied block.
+    
+    Pending transactions have their own lock, so add_transaction never waits
+    for a block being mined; what arrives mid-seal goes into the next block.
+    """
+    
+    # Materialized registries covered by the snapshot state commitment
+    REGISTRY_FIELDS = (
+        'equipment_registry', 'supply_chain_records', 'maintenance_contracts',
+        'carbon_credits', 'safety_incidents'
+    )
+    
+    # Derived state saved in snapshots so a restart only replays newer blocks
+    SNAPSHOT_FIELDS = (
+        'equipment_registry', 'supply_chain_records', 'maintenance_contracts',
+        'carbon_credits', 'safety_incidents',
+        'total_transactions', 'transaction_type_counts', 'serialized_size_bytes',
+        'carbon_co2_reduction_tons', 'carbon_value_usd', 'carbon_rollups',
+        'verified_height', 'verified_hash'
+    )
+    
+    # Secondary indexes; not snapshotted, rebuilt from the stored blocks on load
+    INDEX_FIELDS = (
+        'equipment_index', 'material_index', 'truck_index', 'shipment_index',
+        'transaction_index'
+    )
     
-    def __init__(self):
-        self.chain = [self.create_genesis_block()]
-        self.difficulty = 2
+    def __init__(self, store: Optional[BlockStore] = None,
+                 snapshot_interval: int = config.BLOCKCHAIN_SNAPSHOT_INTERVAL,
+                 miner: Optional[ParallelMiner] = None,
+                 consensus: Optional[ConsensusEngine] = None,
+                 prune_depth: int = 0, archive: Optional[BlockStore] = None,
+                 signer: Optional[TransactionSigner] = None,
+                 verifier: Optional[SignatureVerifier] = None):
+        self.chain = []
+        self.consensus = consensus if consensus is not None else ProofOfWork(difficulty=2, miner=miner)
         self.pending_transactions = []
         self.mining_reward = 100
+        self.store = store
+        self.snapshot_interval = snapshot_interval
+        self.mempool = None
         
+        # Transaction signatures: the signer signs what this node submits,
+        # the verifier checks signatures on submit, seal and import
+        self.signer = signer
+        self.verifier = verifier
+        
+        # Pruning: transaction bodies deeper than prune_depth blocks are dropped
+        # from memory. They stay readable from the block store if there is one,
+        # otherwise from the archive if given; without either they are gone.
+        # Registries (and indexes, unless bodies are gone) still grow with
+        # every transaction, so pruning bounds body memory, not total memory.
+        self.prune_depth = prune_depth
+        self.archive = archive
+        self._archive_base = len(archive) if archive is not None else 0
+        self.pruned_height = -1
+        self.last_snapshot = None
+        # Snapshots are serialized and written off the write lock, one at a time
+        self._snapshot_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='snapshot')
+        self._snapshot_future = None
+        
+        # Single writer; validation has its own lock so readers never wait on sealing
+        self._write_lock = threading.RLock()
+        self._validation_lock = threading.RLock()
+        self._pending_lock = threading.Lock()
+        # Keeps pending batches sealing in submission order
+        self._seal_lock = threading.Lock()
+        self._view = None
+        
+        self._reset_state()
+        
+        # Validation checkpoint: highest block already verified and its hash
+        self.verified_height = 0
+        self.verified_hash = None
+        
+        if store is not None and len(store) > 0:
+            self._load_from_store()
+        else:
+            genesis = self.create_genesis_block()
+            self._append_block(genesis)
+            if store is not None:
+                store.append_block(genesis.to_dict())
+                store.flush()
+        
+        if self.verified_hash is None:
+            self.verified_hash = self.chain[0].hash
+        self._prune()
+        self._publish_view()
+        
+    def _reset_state(self):
+        """Initialize empty derived state (registries, indexes, counters)"""
         # SmartMine specific features
         self.equipment_registry = {}
         self.supply_chain_records = {}
@@ -60,39 +467,552 @@ class SmartMineBlockchain:
         self.carbon_credits = {}
         self.safety_incidents = {}
         
+        # Secondary indexes: key -> [(block_index, tx_position), ...]
+        self.equipment_index = {}
+        self.material_index = {}
+        self.truck_index = {}
+        self.shipment_index = []
+        self.transaction_index = {}
+        
+        # Running statistics, updated as blocks are appended
+        self.total_transactions = 0
+        self.transaction_type_counts = {}
+        self.serialized_size_bytes = 2  # enclosing "[]" of the serialized chain
+        self.carbon_co2_reduction_tons = 0
+        self.carbon_value_usd = 0
+        self.carbon_rollups = CarbonRollups()
+    
     def create_genesis_block(self) -> MiningBlock:
-        """Create the first block in the chain"""
-        return MiningBlock(0, [{"type": "genesis", "message": "SmartMine Blockchain Genesis"}], "0")
+        """Create the first block in the chain
+        
+        Genesis is identical on every node so replicas share a common ancestor.
+        """
+        genesis = MiningBlock(0, [{"type": "genesis", "message": "SmartMine Blockchain Genesis"}], "0")
+        genesis.timestamp = GENESIS_TIMESTAMP
+        genesis.hash = genesis.calculate_hash()
+        return genesis
+    
+    @property
+    def difficulty(self) -> int:
+        """Proof-of-work difficulty (0 for consensus modes without PoW)"""
+        return getattr(self.consensus, 'difficulty', 0)
+    
+    @difficulty.setter
+    def difficulty(self, value: int):
+        self.consensus.difficulty = value
     
     def get_latest_block(self) -> MiningBlock:
         """Get the most recent block"""
         return self.chain[-1]
     
-    def add_transaction(self, transaction: Dict):
-        """Add a transaction to pending transactions"""
-        transaction['id'] = str(uuid.uuid4())
-        transaction['timestamp'] = datetime.now().isoformat()
-        self.pending_transactions.append(transaction)
+    def get_view(self) -> ChainView:
+        """Get the latest published view of the chain"""
+        return self._view
+    
+    def _publish_view(self):
+        """Publish an immutable view of the state after the latest block"""
+        latest = self.chain[-1]
+        self._view = ChainView(
+            height=latest.index,
+            latest_hash=latest.hash,
+            total_transactions=self.total_transactions,
+            transaction_types=dict(self.transaction_type_counts),
+            serialized_size_bytes=self.serialized_size_bytes,
+            registered_equipment=len(self.equipment_registry),
+            supply_chain_records=len(self.supply_chain_records),
+            carbon_credits_issued=len(self.carbon_credits),
+            safety_incidents=len(self.safety_incidents),
+            carbon_co2_reduction_tons=self.carbon_co2_reduction_tons,
+            carbon_value_usd=self.carbon_value_usd,
+            pruned_height=self.pruned_height
+        )
+    
+    def add_transaction(self, transaction: Dict, wait: bool = True):
+        """Add a transaction to pending transactions
+        
+        Transactions signed by their submitter keep their id and timestamp
+        (the signature covers them); others are stamped and, if this node
+        has a signer, signed with its key. Raises ValueError if the
+        signature does not verify. With a mempool attached, ``wait=False``
+        raises MempoolFullError instead of waiting for room.
+        """
+        if not is_signed(transaction):
+            transaction['id'] = str(uuid.uuid4())
+            transaction['timestamp'] = datetime.now().isoformat()
+            if self.signer is not None:
+                self.signer.sign(transaction)
+        if self.verifier is not None and not self.verifier.verify_batch([transaction])[0]:
+            raise ValueError(f"Transaction {transaction.get('id')} has a missing or invalid signature")
+        transaction = make_record(transaction)
+        if self.mempool is not None:
+            self.mempool.submit(transaction, wait=wait)
+        else:
+            with self._pending_lock:
+                self.pending_transactions.append(transaction)
+    
+    def attach_mempool(self, mempool: Mempool):
+        """Route new transactions through a mempool that seals blocks automatically"""
+        with self._pending_lock:
+            if self.pending_transactions:
+                for transaction in self.pending_transactions:
+                    mempool.submit(transaction)
+                self.pending_transactions = []
+            self.mempool = mempool
     
     def mine_pending_transactions(self) -> bool:
         """Mine all pending transactions"""
-        if not self.pending_transactions:
-            return False
+        return self.seal_pending() is not None
+    
+    def seal_pending(self) -> Optional[SealReceipt]:
+        """Seal pending transactions into a block
         
-        block = MiningBlock(
-            len(self.chain),
-            self.pending_transactions,
-            self.get_latest_block().hash
-        )
+        Returns the receipt of the newest sealed block, or None if nothing
+        was pending. Blocks the caller while mining; see seal_pending_async.
+        """
+        start = time.time()
+        if self.mempool is not None:
+            # The mempool takes its own lock before sealing; don't hold ours
+            if not self.mempool.flush():
+                return None
+            block = self.get_latest_block()
+        else:
+            with self._seal_lock:
+                with self._pending_lock:
+                    batch = self.pending_transactions
+                    self.pending_transactions = []
+                if not batch:
+                    return None
+                try:
+                    block = self.seal_block(batch)
+                except Exception:
+                    # Put the batch back ahead of anything submitted meanwhile
+                    with self._pending_lock:
+                        self.pending_transactions[:0] = batch
+                    raise
+        
+        return SealReceipt(block.index, block.hash, (time.time() - start) * 1000)
+    
+    def seal_pending_async(self, executor=None) -> asyncio.Future:
+        """Seal pending transactions without blocking the event loop
+        
+        Must be called from a running event loop. Mining runs in ``executor``
+        (the loop's default thread pool if None); the returned future
+        resolves to the SealReceipt, or None if nothing was pending.
+        """
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(executor, self.seal_pending)
+    
+    def seal_block(self, transactions: List[Dict]) -> MiningBlock:
+        """Mine a block holding ``transactions`` and append it to the chain
+        
+        Transactions whose signatures fail verification, and transactions
+        whose id is already on the chain or earlier in the batch, are left out.
+        """
+        if self.verifier is not None:
+            # Before taking the write lock; transactions checked on submit are cache hits
+            flags = self.verifier.verify_batch(transactions)
+            if not all(flags):
+                print(f"⚠️ Dropping {flags.count(False)} transactions with invalid signatures")
+                transactions = [tx for tx, valid in zip(transactions, flags) if valid]
         
-        block.mine_block(self.difficulty)
+        with self._write_lock:
+            transactions = self._unique_transactions(transactions)
+            previous = self.get_latest_block()
+            block = MiningBlock(
+                len(self.chain),
+                transactions,
+                previous.hash
+            )
+            if block.timestamp < previous.timestamp:
+                # Keep block times non-decreasing so time ranges can be bisected
+                block.timestamp = previous.timestamp
+                block.hash = block.calculate_hash()
+            
+            self.consensus.seal(block)
+            self._commit_block(block)
+            self._publish_view()
+            
+            return block
+    
+    def _unique_transactions(self, transactions: List[Dict]) -> List[Dict]:
+        """Drop transactions whose id is already on the chain or earlier in the batch"""
+        seen = set()
+        unique = []
+        for tx in transactions:
+            tx_id = tx.get('id')
+            if tx_id is not None:
+                if tx_id in seen or tx_id in self.transaction_index:
+                    continue
+                seen.add(tx_id)
+            unique.append(tx)
+        if len(unique) < len(transactions):
+            print(f"⚠️ Dropping {len(transactions) - len(unique)} transactions with duplicate ids")
+        return unique
+    
+    def _check_unique_ids(self, fork_height: int, blocks: List[MiningBlock]):
+        """Raise ValueError if a transaction id repeats within ``blocks`` or below the fork"""
+        seen = set()
+        for block in blocks:
+            for tx in block.transactions:
+                tx_id = tx.get('id')
+                if tx_id is None:
+                    continue
+                location = self.transaction_index.get(tx_id)
+                if tx_id in seen or (location is not None and location[0] <= fork_height):
+                    raise ValueError(f"Block {block.index} repeats transaction {tx_id}")
+                seen.add(tx_id)
+    
+    def _commit_block(self, block: MiningBlock):
+        """Persist and append a sealed block, pruning and snapshotting on schedule"""
+        if self.store is not None:
+            self.store.append_block(block.to_dict())
+        self._append_block(block)
+        
+        if block.index % self.snapshot_interval == 0:
+            self._prune()
+            self.save_snapshot(wait=False)
+    
+    def _append_block(self, block: MiningBlock, transactions: Optional[List[Dict]] = None):
+        """Append a sealed block and update all derived state
+        
+        The block becomes visible to readers when the next view is published.
+        ``transactions`` supplies the body of a block whose body was pruned.
+        """
         self.chain.append(block)
-        self.pending_transactions = []
+        block.on_change = self.invalidate_verification
+        
+        # Materialize the columnar body once for all derived state
+        transactions = list(block.transactions if transactions is None else transactions)
         
         # Process specialized mining transactions
-        self._process_mining_transactions(block.transactions)
+        self._process_mining_transactions(transactions)
+        self._index_block(block, transactions)
+        self._update_counters(block, transactions)
+    
+    def import_blocks(self, fork_height: int, blocks: List[MiningBlock]) -> int:
+        """Adopt validated blocks from a peer that build on our block at ``fork_height``
+        
+        If ``fork_height`` is our tip the blocks are appended. Otherwise the
+        chain is reorganized, which only happens if the peer's chain is longer
+        than ours. Returns the number of blocks adopted.
+        """
+        if not blocks:
+            return 0
+        if self.verifier is not None:
+            # One batch across all blocks keeps every verification worker busy
+            transactions = [tx for block in blocks for tx in block.transactions]
+            flags = self.verifier.verify_batch(transactions)
+            if not all(flags):
+                tx = transactions[flags.index(False)]
+                raise ValueError(f"Transaction {tx.get('id')} has a missing or invalid signature")
+        requeue = []
+        with self._write_lock:
+            tip = len(self.chain) - 1
+            if fork_height > tip:
+                raise ValueError(f"Fork height {fork_height} is above our tip {tip}")
+            parent_hash = self.chain[fork_height].hash if fork_height >= 0 else "0"
+            if blocks[0].index != fork_height + 1 or blocks[0].previous_hash != parent_hash:
+                raise ValueError(f"Blocks do not build on block {fork_height}")
+            self._check_unique_ids(fork_height, blocks)
+            
+            if fork_height == tip:
+                for block in blocks:
+                    self._commit_block(block)
+            elif fork_height + len(blocks) > tip:
+                requeue = self._reorganize(fork_height, blocks)
+            else:
+                return 0
+            
+            self._publish_view()
+        
+        # Outside the write lock: a full mempool may block until it seals
+        for tx in requeue:
+            if self.mempool is not None:
+                self.mempool.submit(tx)
+            else:
+                with self._pending_lock:
+                    self.pending_transactions.append(tx)
+        return len(blocks)
+    
+    def _reorganize(self, fork_height: int, blocks: List[MiningBlock]) -> List:
+        """Replace every block above ``fork_height`` with ``blocks``
+        
+        Derived state for the new chain is rebuilt off to the side and then
+        swapped in, so readers keep seeing the old state until it is ready.
+        Returns the orphaned transactions the new chain does not contain.
+        """
+        if self.pruned_height >= 0 and self.store is None:
+            if self.archive is None:
+                raise ValueError("Cannot reorganize: pruned transaction bodies were discarded")
+            if fork_height < self.pruned_height:
+                raise ValueError(f"Cannot reorganize below archived height {self.pruned_height}")
+        
+        orphaned = [
+            tx for height in range(fork_height + 1, len(self.chain))
+            for tx in self._get_transactions(height)
+        ]
+        
+        replacement = object.__new__(type(self))
+        replacement._reset_state()
+        replacement.chain = []
+        for block in self.chain[:fork_height + 1]:
+            replacement._append_block(block, self._get_transactions(block.index))
+        for block in blocks:
+            replacement._append_block(block)
+        
+        if self.store is not None:
+            # A snapshot still being written must not see the store truncated under it
+            if self._snapshot_future is not None:
+                self._snapshot_future.exception()  # waits; failures were already reported
+            self.store.truncate(fork_height + 1)
+            for block in blocks:
+                self.store.append_block(block.to_dict())
+            self.store.flush()
+        
+        for field in self.SNAPSHOT_FIELDS + self.INDEX_FIELDS:
+            if field not in ('verified_height', 'verified_hash'):
+                setattr(self, field, getattr(replacement, field))
+        self.chain = replacement.chain
+        for block in self.chain:
+            block.on_change = self.invalidate_verification
+        self.pruned_height = min(self.pruned_height, fork_height)
+        self.invalidate_verification(fork_height + 1)
+        self._prune()
+        self.save_snapshot(wait=False)
+        
+        requeue = [make_record(tx) for tx in orphaned
+                   if tx.get('type') != 'genesis' and tx.get('id') not in self.transaction_index]
+        print(f"🔀 Chain reorganized at block {fork_height}: {len(blocks)} blocks adopted, "
+              f"{len(requeue)} orphaned transactions re-queued")
+        return requeue
+    
+    def _load_from_store(self):
+        """Restore the chain from the block store
+        
+        Derived state comes from the latest snapshot when it matches the
+        stored chain; only blocks sealed after the snapshot are replayed.
+        The secondary indexes are not snapshotted and are rebuilt from the
+        stored blocks.
+        """
+        snapshot = self.store.load_snapshot()
+        height = snapshot['height'] if snapshot else -1
+        if not (0 <= height < len(self.store) and
+                set(self.SNAPSHOT_FIELDS) <= set(snapshot['state']) and
+                self.store.read_block(height)['hash'] == snapshot['block_hash']):
+            snapshot = None
+        
+        if snapshot is not None:
+            self._restore_state(snapshot['state'])
+            for data in self.store.iter_blocks(0, height + 1):
+                block = MiningBlock.from_dict(data)
+                block.on_change = self.invalidate_verification
+                self.chain.append(block)
+                self._index_block(block, data['transactions'])
+            self.last_snapshot = {key: value for key, value in snapshot.items() if key != 'state'}
+            start = height + 1
+        else:
+            start = 0
+        
+        for data in self.store.iter_blocks(start):
+            self._append_block(MiningBlock.from_dict(data))
+    
+    def _snapshot_state(self) -> Dict:
+        """Copy the derived state for a snapshot (call under the write lock)
+        
+        Registry entries are never changed after insertion except for
+        equipment maintenance histories, which only grow, so shallow copies
+        are enough and the copy can be serialized without the lock.
+        """
+        state = {field: getattr(self, field) for field in self.SNAPSHOT_FIELDS}
+        for field in self.REGISTRY_FIELDS:
+            state[field] = dict(state[field])
+        state['equipment_registry'] = {
+            equipment_id: dict(equipment, maintenance_history=list(equipment['maintenance_history']))
+            for equipment_id, equipment in self.equipment_registry.items()
+        }
+        state['transaction_type_counts'] = dict(self.transaction_type_counts)
+        state['carbon_rollups'] = self.carbon_rollups.to_dict()
+        return state
+    
+    def _restore_state(self, state: Dict):
+        """Restore derived state captured by _snapshot_state"""
+        for field in self.SNAPSHOT_FIELDS:
+            setattr(self, field, state[field])
+        self.carbon_rollups = CarbonRollups.from_dict(state['carbon_rollups'])
+    
+    def compute_state_commitment(self, state: Optional[Dict] = None) -> str:
+        """Hash the materialized registries (live, or from a snapshot state) into a state commitment"""
+        registries = {field: state[field] if state is not None else getattr(self, field)
+                      for field in self.REGISTRY_FIELDS}
+        digest = hashlib.sha256()
+        for chunk in iterencode(registries, depth=2, sort_keys=True):
+            digest.update(chunk.encode())
+        return digest.hexdigest()
+    
+    def save_snapshot(self, wait: bool = True):
+        """Persist a snapshot of the derived state at the current height
+        
+        Snapshots go to the block store, or to the archive for pruned
+        in-memory ledgers, and carry a commitment over the registries. A
+        pruned ledger with neither only keeps the commitment in memory.
         
-        return True
+        Only copying the state holds the write lock; hashing, serializing
+        and writing happen on the snapshot thread. With ``wait=False`` the
+        call returns at once, and is skipped while the previous snapshot is
+        still being written.
+        """
+        target = self.store if self.store is not None else self.archive
+        if target is None and not self.prune_depth:
+            return
+        if not wait and self._snapshot_future is not None and not self._snapshot_future.done():
+            return
+        with self._write_lock:
+            latest = self.get_latest_block()
+            snapshot = {'height': latest.index, 'block_hash': latest.hash}
+            state = self._snapshot_state()
+            self._snapshot_future = self._snapshot_executor.submit(self._write_snapshot, target, snapshot, state)
+        if wait:
+            self._snapshot_future.result()
+    
+    def _write_snapshot(self, target: Optional[BlockStore], snapshot: Dict, state: Dict):
+        """Commit to and write a snapshot copied by save_snapshot (runs on the snapshot thread)"""
+        try:
+            snapshot['state_commitment'] = self.compute_state_commitment(state)
+            snapshot['created_at'] = datetime.now().isoformat()
+            if target is not None:
+                target.save_snapshot(dict(snapshot, state=state))
+            self.last_snapshot = snapshot
+        except Exception as e:
+            print(f"⚠️ Snapshot at block {snapshot['height']} failed: {e}")
+            raise
+    
+    def _prune(self):
+        """Drop transaction bodies of blocks deeper than prune_depth
+        
+        Without a block store the bodies are first appended to the archive.
+        With neither, the index entries pointing at them are dropped too.
+        
+        Memory is not bounded by prune_depth: the registries keep an entry
+        per equipment, shipment, credit and incident in every mode, and
+        with a store or archive the secondary indexes keep their entries
+        for pruned heights (about 800 bytes per transaction in total,
+        against about 1 KB unpruned and 650 bytes with bodies discarded).
+        """
+        if not self.prune_depth:
+            return
+        prune_to = len(self.chain) - 1 - self.prune_depth
+        if prune_to <= self.pruned_height:
+            return
+        
+        discard_bodies = self.store is None and self.archive is None
+        touched = set()
+        for height in range(self.pruned_height + 1, prune_to + 1):
+            block = self.chain[height]
+            if discard_bodies:
+                touched.update(self._drop_transaction_index(block))
+            elif self.store is None:
+                self.archive.append_block({'index': height, 'transactions': block.transactions.to_dicts()})
+            block.transactions = None
+        self.pruned_height = prune_to
+        
+        if discard_bodies:
+            # Replace trimmed lists rather than mutating them; readers may be iterating
+            bound = (prune_to, float('inf'))
+            for field, key in touched:
+                index = getattr(self, field)
+                locations = index[key][bisect.bisect_right(index[key], bound):]
+                if locations:
+                    index[key] = locations
+                else:
+                    del index[key]
+            self.shipment_index = self.shipment_index[bisect.bisect_right(self.shipment_index, bound):]
+    
+    def _drop_transaction_index(self, block: MiningBlock) -> set:
+        """Forget a pruned block's transaction ids; return the (index, key) pairs it touches"""
+        touched = set()
+        for tx in block.transactions:
+            self.transaction_index.pop(tx.get('id'), None)
+            equipment_id = tx.get('equipment_id') or tx.get('equipment_involved')
+            if equipment_id:
+                touched.add(('equipment_index', equipment_id))
+            if tx.get('type') == 'supply_chain':
+                touched.add(('material_index', tx.get('material_type')))
+                if tx.get('truck_id'):
+                    touched.add(('truck_index', tx['truck_id']))
+        return touched
+    
+    def _get_transactions(self, block_index: int) -> Optional[List[Dict]]:
+        """Get a block's transactions, reading pruned bodies back from disk"""
+        transactions = self.chain[block_index].transactions
+        if transactions is not None:
+            return transactions
+        if self.store is not None:
+            return self.store.read_block(block_index)['transactions']
+        if self.archive is not None:
+            return self.archive.read_block(self._archive_base + block_index)['transactions']
+        return None
+    
+    def close(self):
+        """Seal queued transactions, then snapshot and close the block store"""
+        if self.mempool is not None:
+            self.mempool.stop()
+        with self._write_lock:
+            if self._snapshot_executor is None:
+                return
+            self.save_snapshot()
+            self._snapshot_executor.shutdown()
+            self._snapshot_executor = None
+            if self.store is not None:
+                self.store.close()
+            if self.archive is not None:
+                self.archive.close()
+    
+    def _update_counters(self, block: MiningBlock, transactions: List[Dict]):
+        """Fold a newly appended block into the running statistics"""
+        self.total_transactions += len(transactions)
+        for tx in transactions:
+            tx_type = tx.get('type', 'unknown')
+            self.transaction_type_counts[tx_type] = self.transaction_type_counts.get(tx_type, 0) + 1
+        
+        # Same size as the block's share of json.dumps([block.to_dict(), ...])
+        separator = 2 if block.index > 0 else 0
+        self.serialized_size_bytes += len(json.dumps(block.to_dict())) + separator
+    
+    def _index_block(self, block: MiningBlock, transactions: List[Dict]):
+        """Add a block's transactions to the secondary indexes"""
+        for position, tx in enumerate(transactions):
+            location = (block.index, position)
+            
+            if 'id' in tx:
+                self.transaction_index[tx['id']] = location
+            
+            equipment_id = tx.get('equipment_id') or tx.get('equipment_involved')
+            if equipment_id:
+                self.equipment_index.setdefault(equipment_id, []).append(location)
+            
+            if tx.get('type') == 'supply_chain':
+                self.shipment_index.append(location)
+                self.material_index.setdefault(tx.get('material_type'), []).append(location)
+                if tx.get('truck_id'):
+                    self.truck_index.setdefault(tx['truck_id'], []).append(location)
+    
+    def _get_transaction(self, location: Tuple[int, int]) -> Optional[Dict]:
+        """Resolve an index entry to its transaction (None if pruned without archive)"""
+        block_index, position = location
+        transactions = self._get_transactions(block_index)
+        return transactions[position] if transactions is not None else None
+    
+    @staticmethod
+    def _visible(locations: List[Tuple[int, int]], height: int):
+        """Yield index entries at or below ``height``
+        
+        Index lists are append-only and in block order, so entries added by a
+        block the reader's view does not include yet are all at the end.
+        """
+        for location in locations:
+            if location[0] > height:
+                break
+            yield location
     
     def _process_mining_transactions(self, transactions: List[Dict]):
         """Process SmartMine specific transactions"""
@@ -167,7 +1087,7 @@ class SmartMineBlockchain:
                 'cost': tx['cost']
             })
     
-    def track_material_shipment(self, shipment_data: Dict):
+    def track_material_shipment(self, shipment_data: Dict, wait: bool = True):
         """📦 Track material shipments on blockchain"""
         transaction = {
             'type': 'supply_chain',
@@ -181,7 +1101,7 @@ class SmartMineBlockchain:
             'environmental_impact': shipment_data.get('environmental_impact', {}),
             'operator': 'SmartMine_System'
         }
-        self.add_transaction(transaction)
+        self.add_transaction(transaction, wait=wait)
     
     def _track_supply_chain(self, tx: Dict):
         """Process supply chain transaction"""
@@ -222,6 +1142,10 @@ class SmartMineBlockchain:
             'value_usd': tx['credit_value_usd'],
             'status': 'active'
         }
+        self.carbon_co2_reduction_tons += tx['co2_reduction_tons']
+        self.carbon_value_usd += tx['credit_value_usd']
+        self.carbon_rollups.add(tx['timestamp'], tx['green_practice'], tx.get('equipment_id'),
+                                tx['co2_reduction_tons'], tx['credit_value_usd'])
     
     def record_safety_incident(self, incident_data: Dict):
         """🛡️ Record safety incidents immutably"""
@@ -253,25 +1177,31 @@ class SmartMineBlockchain:
     
     def get_equipment_history(self, equipment_id: str) -> Dict:
         """Get complete equipment history from blockchain"""
-        if equipment_id not in self.equipment_registry:
+        view = self.get_view()
+        equipment = self.equipment_registry.get(equipment_id)
+        if equipment is None or equipment['registration_block'] > view.height:
             return {"error": "Equipment not found"}
         
-        equipment = self.equipment_registry[equipment_id]
+        # Copy so the writer can keep appending to the live registry entry
+        equipment = dict(equipment)
+        equipment['maintenance_history'] = [
+            record for record in list(equipment['maintenance_history'])
+            if record['block_index'] <= view.height
+        ]
         
         # Get all maintenance records
         maintenance_history = []
-        for block in self.chain:
-            for tx in block.transactions:
-                if (tx.get('type') == 'maintenance_record' and 
-                    tx.get('equipment_id') == equipment_id):
-                    maintenance_history.append({
-                        'block_index': block.index,
-                        'timestamp': tx['timestamp'],
-                        'type': tx['maintenance_type'],
-                        'description': tx['description'],
-                        'cost': tx.get('cost', 0),
-                        'technician': tx.get('technician', 'Unknown')
-                    })
+        for location in self._visible(self.equipment_index.get(equipment_id, []), view.height):
+            tx = self._get_transaction(location)
+            if tx is not None and tx.get('type') == 'maintenance_record':
+                maintenance_history.append({
+                    'block_index': location[0],
+                    'timestamp': tx['timestamp'],
+                    'type': tx['maintenance_type'],
+                    'description': tx['description'],
+                    'cost': tx.get('cost', 0),
+                    'technician': tx.get('technician', 'Unknown')
+                })
         
         return {
             'equipment_id': equipment_id,
@@ -282,92 +1212,380 @@ class SmartMineBlockchain:
             'blockchain_verified': True
         }
     
-    def get_supply_chain_trace(self, material_type: str = None) -> List[Dict]:
+    def get_supply_chain_trace(self, material_type: str = None, truck_id: str = None) -> List[Dict]:
         """Get supply chain traceability"""
-        shipments = []
+        view = self.get_view()
+        if truck_id is not None:
+            locations = self.truck_index.get(truck_id, [])
+        elif material_type is not None:
+            locations = self.material_index.get(material_type, [])
+        else:
+            locations = self.shipment_index
         
-        for block in self.chain:
-            for tx in block.transactions:
-                if tx.get('type') == 'supply_chain':
-                    if material_type is None or tx.get('material_type') == material_type:
-                        shipments.append({
-                            'block_index': block.index,
-                            'shipment_id': tx['shipment_id'],
-                            'timestamp': tx['timestamp'],
-                            'material_type': tx['material_type'],
-                            'quantity': tx['quantity'],
-                            'route': f"{tx['source_location']} → {tx['destination']}",
-                            'truck_id': tx.get('truck_id', ''),
-                            'hash': block.hash
-                        })
+        shipments = []
+        for location in self._visible(locations, view.height):
+            tx = self._get_transaction(location)
+            if tx is None:
+                continue
+            if material_type is not None and tx.get('material_type') != material_type:
+                continue
+            block = self.chain[location[0]]
+            shipments.append({
+                'block_index': block.index,
+                'shipment_id': tx['shipment_id'],
+                'timestamp': tx['timestamp'],
+                'material_type': tx['material_type'],
+                'quantity': tx['quantity'],
+                'route': f"{tx['source_location']} → {tx['destination']}",
+                'truck_id': tx.get('truck_id', ''),
+                'hash': block.hash
+            })
         
         return shipments
     
+    def get_transaction_proof(self, transaction_id: str) -> Dict:
+        """Get a Merkle inclusion proof for a transaction"""
+        location = self.transaction_index.get(transaction_id)
+        if location is None or location[0] > self.get_view().height:
+            return {"error": "Transaction not found"}
+        
+        block_index, position = location
+        block = self.chain[block_index]
+        transactions = self._get_transactions(block_index)
+        if transactions is None:
+            return {"error": "Transaction body has been pruned"}
+        
+        return {
+            'transaction': as_dict(transactions[position]),
+            'position': position,
+            'proof': block.get_merkle_proof(position, transactions),
+            'block_header': block.get_header()
+        }
+    
+    def _height_range(self, height: int, start_height: Optional[int], end_height: Optional[int],
+                      start_time: Optional[float], end_time: Optional[float]) -> Tuple[int, int]:
+        """Resolve height bounds (inclusive) and time bounds ([start, end)) to a height slice"""
+        low, high = 0, height + 1
+        if start_height is not None:
+            low = max(low, start_height)
+        if end_height is not None:
+            high = min(high, end_height + 1)
+        
+        # Block timestamps never decrease, so time bounds are binary searches
+        times = _BlockTimes(self.chain)
+        if start_time is not None:
+            low = max(low, bisect.bisect_left(times, start_time, 0, height + 1))
+        if end_time is not None:
+            high = min(high, bisect.bisect_left(times, end_time, 0, height + 1))
+        return low, max(low, high)
+    
+    def get_blocks(self, start_height: Optional[int] = None, end_height: Optional[int] = None,
+                   start_time: Optional[float] = None, end_time: Optional[float] = None,
+                   cursor: Optional[str] = None, limit: int = 100,
+                   include_transactions: bool = False) -> Dict:
+        """Get a page of block headers by height and/or sealing time
+        
+        Pass the returned ``next_cursor`` back to get the following page; it
+        is None after the last page. Raises ValueError if ``limit`` is below 1.
+        """
+        if limit < 1:
+            raise ValueError(f"limit must be at least 1, got {limit}")
+        view = self.get_view()
+        low, high = self._height_range(view.height, start_height, end_height, start_time, end_time)
+        if cursor is not None:
+            low = max(low, int(cursor))
+        stop = min(high, low + limit)
+        
+        blocks = []
+        for block_index in range(low, stop):
+            block = self.chain[block_index]
+            entry = block.get_header()
+            entry['bloom'] = block.bloom.to_dict() if block.bloom is not None else None
+            if include_transactions:
+                transactions = self._get_transactions(block_index)
+                entry['transactions'] = (
+                    [as_dict(tx) for tx in transactions] if transactions is not None else None
+                )
+            blocks.append(entry)
+        
+        return {
+            'blocks': blocks,
+            'next_cursor': str(stop) if stop < high else None
+        }
+    
+    def get_transactions_in_range(self, start_height: Optional[int] = None, end_height: Optional[int] = None,
+                                  start_time: Optional[float] = None, end_time: Optional[float] = None,
+                                  tx_type: Optional[str] = None, cursor: Optional[str] = None,
+                                  limit: int = 100) -> Dict:
+        """Get a page of transactions from blocks in a height and/or time range
+        
+        Time bounds apply to block sealing time. Bodies pruned without an
+        archive are skipped. The cursor is ``"<block>:<position>"``. Raises
+        ValueError if ``limit`` is below 1.
+        """
+        if limit < 1:
+            raise ValueError(f"limit must be at least 1, got {limit}")
+        view = self.get_view()
+        low, high = self._height_range(view.height, start_height, end_height, start_time, end_time)
+        skip = 0
+        if cursor is not None:
+            cursor_block, cursor_position = (int(part) for part in cursor.split(':'))
+            if cursor_block >= low:
+                low, skip = cursor_block, cursor_position
+        
+        results = []
+        for block_index in range(low, high):
+            transactions = self._get_transactions(block_index)
+            if transactions is None:
+                skip = 0
+                continue
+            for position in range(skip, len(transactions)):
+                if len(results) == limit:
+                    return {'transactions': results, 'next_cursor': f"{block_index}:{position}"}
+                tx = transactions[position]
+                if tx_type is not None and tx.get('type') != tx_type:
+                    continue
+                results.append({
+                    'block_index': block_index,
+                    'position': position,
+                    'transaction': as_dict(tx)
+                })
+            skip = 0
+        
+        return {'transactions': results, 'next_cursor': None}
+    
+    def iter_blocks(self, start_height: Optional[int] = None, end_height: Optional[int] = None,
+                    start_time: Optional[float] = None, end_time: Optional[float] = None):
+        """Yield ``(block, transactions)`` for blocks in a height and/or time range
+        
+        Bodies are loaded one block at a time; ``transactions`` is None for
+        blocks pruned without an archive. The range is fixed by the view
+        current when iteration starts.
+        """
+        view = self.get_view()
+        chain = self.chain
+        low, high = self._height_range(view.height, start_height, end_height, start_time, end_time)
+        for block_index in range(low, high):
+            yield chain[block_index], self._get_transactions(block_index)
+    
+    def find_transactions(self, key: str, start_height: Optional[int] = None,
+                          end_height: Optional[int] = None, start_time: Optional[float] = None,
+                          end_time: Optional[float] = None, use_bloom: bool = True) -> List[Dict]:
+        """Find transactions referencing an equipment, truck, shipment or credit id
+        
+        Blocks whose Bloom filter rules the key out are skipped without
+        reading their bodies; ``use_bloom=False`` scans every block.
+        """
+        view = self.get_view()
+        low, high = self._height_range(view.height, start_height, end_height, start_time, end_time)
+        
+        results = []
+        for block_index in range(low, high):
+            if use_bloom and not self.chain[block_index].may_contain(key):
+                continue
+            transactions = self._get_transactions(block_index)
+            if transactions is None:
+                continue
+            for position, tx in enumerate(transactions):
+                if any(tx.get(field) == key for field in BLOOM_FIELDS):
+                    results.append({
+                        'block_index': block_index,
+                        'position': position,
+                        'transaction': as_dict(tx)
+                    })
+        return results
+    
     def get_carbon_credits_summary(self) -> Dict:
         """Get carbon credits summary"""
-        total_credits = len(self.carbon_credits)
-        total_co2_reduction = sum(
-            credit['co2_reduction_tons'] for credit in self.carbon_credits.values()
-        )
-        total_value = sum(
-            credit['value_usd'] for credit in self.carbon_credits.values()
-        )
+        view = self.get_view()
+        total_credits = view.carbon_credits_issued
+        total_co2_reduction = view.carbon_co2_reduction_tons
+        total_value = view.carbon_value_usd
         
         return {
             'total_credits_issued': total_credits,
             'total_co2_reduction_tons': total_co2_reduction,
             'total_value_usd': total_value,
             'average_credit_value': total_value / total_credits if total_credits > 0 else 0,
+            'by_practice': self.carbon_rollups.get_totals('practice'),
             'blockchain_verified': True
         }
     
-    def validate_chain(self) -> bool:
-        """Validate the entire blockchain"""
-        for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i - 1]
+    def get_carbon_credit_totals(self, dimension: str = 'practice') -> Dict:
+        """Get running carbon-credit totals per practice or per equipment"""
+        return self.carbon_rollups.get_totals(dimension)
+    
+    def get_carbon_credit_series(self, granularity: str = 'day', start_time: Optional[float] = None,
+                                 end_time: Optional[float] = None, practice: Optional[str] = None,
+                                 equipment_id: Optional[str] = None,
+                                 group_by: Optional[str] = None) -> List[Dict]:
+        """Get hourly, daily or monthly carbon-credit rollups over [start_time, end_time)"""
+        return self.carbon_rollups.get_series(granularity, start_time, end_time,
+                                              practice, equipment_id, group_by)
+    
+    def validate_chain(self, full: bool = False) -> bool:
+        """Validate the blockchain up to the current view
+        
+        Blocks up to the verified-height checkpoint are trusted and only
+        newer blocks are re-hashed. Changing a block's body or any header
+        field moves the checkpoint below it. Validation starts again from genesis
+        if ``full`` is set or the checkpoint no longer matches the chain
+        (e.g. the chain was replaced or the checkpointed block altered).
+        """
+        height = self.get_view().height
+        with self._validation_lock:
+            start = self.verified_height + 1
+            checkpoint = self.chain[self.verified_height] if self.verified_height <= height else None
+            if (full or checkpoint is None or checkpoint.hash != self.verified_hash or
+                    (checkpoint.index > 0 and checkpoint.hash != checkpoint.calculate_hash())):
+                self.invalidate_verification(1)
+                start = 1
             
-            # Check if current block's hash is valid
-            if current_block.hash != current_block.calculate_hash():
-                return False
+            for i in range(start, height + 1):
+                current_block = self.chain[i]
+                previous_block = self.chain[i - 1]
+                
+                # Check if current block's hash is valid
+                if current_block.hash != current_block.calculate_hash():
+                    return False
+                
+                # Check that the header commits to the block's transactions
+                # (bodies pruned without an archive can only be checked by header)
+                transactions = self._get_transactions(i)
+                if (transactions is not None and current_block.merkle_root !=
+                        compute_merkle_root([hash_transaction(tx) for tx in transactions])):
+                    return False
+                
+                # Each transaction id is on the chain once: where the index points
+                if transactions is not None and any(
+                        'id' in tx and self.transaction_index.get(tx['id']) != (i, position)
+                        for position, tx in enumerate(transactions)):
+                    return False
+                
+                # Check if current block points to previous block
+                if current_block.previous_hash != previous_block.hash:
+                    return False
+                
+                # Check the seal (PoW target or authority signature)
+                if not self.consensus.validate_header(current_block.get_header()):
+                    return False
+                
+                self.verified_height = i
+                self.verified_hash = current_block.hash
             
-            # Check if current block points to previous block
-            if current_block.previous_hash != previous_block.hash:
-                return False
-        
-        return True
+            return True
+    
+    def invalidate_verification(self, height: int):
+        """Drop the validation checkpoint below a block modified at ``height``"""
+        with self._validation_lock:
+            height = max(0, min(height - 1, self.verified_height, len(self.chain) - 1))
+            self.verified_height = height
+            self.verified_hash = self.chain[height].hash
     
     def get_blockchain_stats(self) -> Dict:
         """Get comprehensive blockchain statistics"""
-        total_blocks = len(self.chain)
-        total_transactions = sum(len(block.transactions) for block in self.chain)
-        
-        # Count transaction types
-        transaction_types = {}
-        for block in self.chain:
-            for tx in block.transactions:
-                tx_type = tx.get('type', 'unknown')
-                transaction_types[tx_type] = transaction_types.get(tx_type, 0) + 1
-        
+        view = self.get_view()
         return {
-            'total_blocks': total_blocks,
-            'total_transactions': total_transactions,
+            'total_blocks': view.height + 1,
+            'total_transactions': view.total_transactions,
             'chain_valid': self.validate_chain(),
-            'registered_equipment': len(self.equipment_registry),
-            'supply_chain_records': len(self.supply_chain_records),
-            'carbon_credits_issued': len(self.carbon_credits),
-            'safety_incidents': len(self.safety_incidents),
-            'transaction_types': transaction_types,
-            'latest_block_hash': self.get_latest_block().hash,
-            'blockchain_size_mb': len(json.dumps([block.__dict__ for block in self.chain])) / 1024 / 1024
+            'registered_equipment': view.registered_equipment,
+            'supply_chain_records': view.supply_chain_records,
+            'carbon_credits_issued': view.carbon_credits_issued,
+            'safety_incidents': view.safety_incidents,
+            'transaction_types': dict(view.transaction_types),
+            'latest_block_hash': view.latest_hash,
+            'blockchain_size_mb': view.serialized_size_bytes / 1024 / 1024,
+            'consensus': self.consensus.get_info(),
+            'pruned_height': view.pruned_height,
+            'last_snapshot': self.last_snapshot,
+            'signatures': self.verifier.get_metrics() if self.verifier is not None else None
         }
 
+def create_consensus() -> ConsensusEngine:
+    """Create the consensus engine selected by BLOCKCHAIN_CONSENSUS"""
+    if config.BLOCKCHAIN_CONSENSUS == 'poa':
+        if config.BLOCKCHAIN_AUTHORITY_KEY:
+            private_key = ProofOfAuthority.load_private_key(config.BLOCKCHAIN_AUTHORITY_KEY)
+        else:
+            private_key = Ed25519PrivateKey.generate()
+            print("⚠️ BLOCKCHAIN_AUTHORITY_KEY not set - using an ephemeral authority key")
+        return ProofOfAuthority(
+            config.BLOCKCHAIN_AUTHORITY_ID,
+            private_key=private_key,
+            authorities=ProofOfAuthority.parse_authorities(config.BLOCKCHAIN_AUTHORITIES)
+        )
+    
+    miner = None
+    if config.BLOCKCHAIN_MINING_WORKERS > 1:
+        miner = ParallelMiner(config.BLOCKCHAIN_MINING_WORKERS, config.BLOCKCHAIN_MINING_TIMEOUT)
+        atexit.register(miner.shutdown)
+    return ProofOfWork(
+        difficulty=config.BLOCKCHAIN_DIFFICULTY,
+        miner=miner,
+        min_difficulty=min(config.BLOCKCHAIN_MIN_DIFFICULTY, config.BLOCKCHAIN_DIFFICULTY)
+    )
+
+def create_signer() -> Optional[TransactionSigner]:
+    """Create the signer for transactions this node submits, if configured"""
+    if config.BLOCKCHAIN_OPERATOR_KEY:
+        return TransactionSigner(ProofOfAuthority.load_private_key(config.BLOCKCHAIN_OPERATOR_KEY))
+    if config.BLOCKCHAIN_REQUIRE_SIGNATURES:
+        print("⚠️ BLOCKCHAIN_OPERATOR_KEY not set - signing transactions with an ephemeral key")
+        return TransactionSigner(Ed25519PrivateKey.generate())
+    return None
+
+def create_verifier() -> SignatureVerifier:
+    """Create the transaction signature verifier"""
+    verifier = SignatureVerifier(
+        workers=config.BLOCKCHAIN_VERIFY_WORKERS,
+        cache_size=config.BLOCKCHAIN_SIGNATURE_CACHE_SIZE,
+        require_signatures=config.BLOCKCHAIN_REQUIRE_SIGNATURES
+    )
+    atexit.register(verifier.shutdown)
+    return verifier
+
+def create_blockchain() -> SmartMineBlockchain:
+    """Create the blockchain, backed by the on-disk block store if enabled"""
+    store = None
+    if config.BLOCKCHAIN_PERSIST:
+        store = BlockStore(config.BLOCKCHAIN_DATA_DIR, fsync_batch=config.BLOCKCHAIN_FSYNC_BATCH)
+    archive = None
+    if config.BLOCKCHAIN_ARCHIVE and store is None:
+        archive = BlockStore(config.BLOCKCHAIN_ARCHIVE_DIR, fsync_batch=config.BLOCKCHAIN_FSYNC_BATCH)
+    blockchain = SmartMineBlockchain(
+        store=store,
+        consensus=create_consensus(),
+        prune_depth=config.BLOCKCHAIN_PRUNE_DEPTH,
+        archive=archive,
+        signer=create_signer(),
+        verifier=create_verifier()
+    )
+    
+    if config.BLOCKCHAIN_MEMPOOL_ENABLED:
+        mempool = Mempool(
+            blockchain,
+            max_block_transactions=config.BLOCKCHAIN_BLOCK_MAX_TRANSACTIONS,
+            max_block_age_ms=config.BLOCKCHAIN_BLOCK_MAX_AGE_MS,
+            capacity=config.BLOCKCHAIN_MEMPOOL_CAPACITY,
+            full_policy=config.BLOCKCHAIN_MEMPOOL_FULL_POLICY
+        )
+        blockchain.attach_mempool(mempool)
+        mempool.start()
+    
+    if store is not None or archive is not None or blockchain.mempool is not None:
+        atexit.register(blockchain.close)
+    return blockchain
+
 # Global blockchain instance
-smartmine_blockchain = SmartMineBlockchain()
+smartmine_blockchain = create_blockchain()
 
 # Demo data initialization
 def initialize_demo_blockchain():
     """Initialize blockchain with demo data"""
+    if len(smartmine_blockchain.chain) > 1:
+        print("✅ SmartMine Blockchain restored from disk!")
+        return
     
     # Register demo equipment
     smartmine_blockchain.register_equipment('TRUCK_001', {
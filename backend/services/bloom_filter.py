@@ -0,0 +1,61 @@
+"""
+🌸 SMARTMINE BLOOM FILTER
+Compact probabilistic set membership for per-block key lookups
+- Sized from the key count and a target false-positive rate
+- No false negatives: a miss means the block definitely lacks the key
+- Hex serialization for block storage and light clients
+"""
+
+import hashlib
+import math
+from typing import Dict, Iterable
+
+DEFAULT_FALSE_POSITIVE_RATE = 0.001
+
+
+class BloomFilter:
+    """Bloom filter over string keys using double hashing of one BLAKE2b digest"""
+
+    __slots__ = ('bits', 'num_bits', 'num_hashes')
+
+    def __init__(self, num_bits: int, num_hashes: int, bits: bytes = None):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bytearray(bits) if bits is not None else bytearray((num_bits + 7) // 8)
+
+    @classmethod
+    def from_keys(cls, keys: Iterable[str],
+                  false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE) -> 'BloomFilter':
+        """Build a filter sized for ``keys``"""
+        keys = set(keys)
+        count = max(len(keys), 1)
+        num_bits = max(64, math.ceil(-count * math.log(false_positive_rate) / math.log(2) ** 2))
+        num_bits = (num_bits + 7) // 8 * 8
+        num_hashes = max(1, round(num_bits / count * math.log(2)))
+        bloom = cls(num_bits, num_hashes)
+        for key in keys:
+            bloom.add(key)
+        return bloom
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (first + i * second) % self.num_bits
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def to_dict(self) -> Dict:
+        return {'hashes': self.num_hashes, 'bits': self.bits.hex()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'BloomFilter':
+        bits = bytes.fromhex(data['bits'])
+        return cls(len(bits) * 8, data['hashes'], bits)
@@ -0,0 +1,167 @@
+"""
+🌱 SMARTMINE CARBON ROLLUPS
+Incremental carbon-credit aggregates for ESG reporting
+- Running totals by green practice and by equipment
+- Hourly, daily and monthly buckets, each split by practice and equipment
+- Updated once per credit as blocks are processed; queries cost
+  O(buckets in range), never O(credits)
+
+Bucket keys are the local-time ISO prefix of the bucket start
+('2024-05-01T13:00', '2024-05-01', '2024-05'), so they sort chronologically.
+"""
+
+import bisect
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+GRANULARITIES = {
+    'hour': '%Y-%m-%dT%H:00',
+    'day': '%Y-%m-%d',
+    'month': '%Y-%m'
+}
+DIMENSIONS = ('practice', 'equipment')
+
+_EPSILON = timedelta(microseconds=1)
+
+
+def _empty() -> List:
+    return [0, 0, 0]  # credits, tons of CO2, USD
+
+
+def _add(totals: List, co2: float, value: float):
+    totals[0] += 1
+    totals[1] += co2
+    totals[2] += value
+
+
+def _entry(totals: List) -> Dict:
+    return {
+        'credits': totals[0],
+        'co2_reduction_tons': totals[1],
+        'value_usd': totals[2]
+    }
+
+
+def _copy_totals(labels: Dict) -> Dict:
+    return {label: list(totals) for label, totals in labels.items()}
+
+
+def _as_datetime(value) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromtimestamp(value)
+
+
+class CarbonRollups:
+    """Running and time-bucketed carbon-credit aggregates"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.totals = {dimension: {} for dimension in DIMENSIONS}
+        # granularity -> bucket key -> {'total': [...], 'practice': {...}, 'equipment': {...}}
+        self.buckets = {granularity: {} for granularity in GRANULARITIES}
+        self._keys = {granularity: [] for granularity in GRANULARITIES}
+
+    def add(self, timestamp: str, practice: str, equipment_id: str, co2: float, value: float):
+        """Fold one issued credit into the totals and its buckets"""
+        try:
+            issued = datetime.fromisoformat(timestamp)
+        except (TypeError, ValueError):
+            issued = None
+        labels = {'practice': practice or 'unspecified', 'equipment': equipment_id or 'unassigned'}
+
+        with self._lock:
+            for dimension, label in labels.items():
+                _add(self.totals[dimension].setdefault(label, _empty()), co2, value)
+            if issued is None:
+                return
+            for granularity, fmt in GRANULARITIES.items():
+                key = issued.strftime(fmt)
+                buckets = self.buckets[granularity]
+                bucket = buckets.get(key)
+                if bucket is None:
+                    bucket = buckets[key] = {'total': _empty(), 'practice': {}, 'equipment': {}}
+                    keys = self._keys[granularity]
+                    if keys and key < keys[-1]:
+                        bisect.insort(keys, key)
+                    else:
+                        keys.append(key)
+                _add(bucket['total'], co2, value)
+                for dimension, label in labels.items():
+                    _add(bucket[dimension].setdefault(label, _empty()), co2, value)
+
+    def get_totals(self, dimension: str) -> Dict:
+        """Running totals per practice or per equipment"""
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension '{dimension}' (expected one of {', '.join(DIMENSIONS)})")
+        with self._lock:
+            return {label: _entry(totals) for label, totals in self.totals[dimension].items()}
+
+    def get_series(self, granularity: str = 'day', start=None, end=None,
+                   practice: Optional[str] = None, equipment_id: Optional[str] = None,
+                   group_by: Optional[str] = None) -> List[Dict]:
+        """Get non-empty buckets overlapping [start, end)
+
+        ``start``/``end`` are datetimes or epoch seconds. ``practice`` or
+        ``equipment_id`` narrow each bucket to one label; ``group_by``
+        ('practice' or 'equipment') adds a per-label breakdown instead.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity '{granularity}' "
+                             f"(expected one of {', '.join(GRANULARITIES)})")
+        if group_by is not None and group_by not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension '{group_by}' (expected one of {', '.join(DIMENSIONS)})")
+        if practice is not None and equipment_id is not None:
+            raise ValueError("Filter by practice or by equipment, not both")
+        fmt = GRANULARITIES[granularity]
+        start, end = _as_datetime(start), _as_datetime(end)
+
+        with self._lock:
+            keys = self._keys[granularity]
+            low = bisect.bisect_left(keys, start.strftime(fmt)) if start is not None else 0
+            high = bisect.bisect_right(keys, (end - _EPSILON).strftime(fmt)) if end is not None else len(keys)
+
+            series = []
+            for key in keys[low:high]:
+                bucket = self.buckets[granularity][key]
+                if practice is not None:
+                    totals = bucket['practice'].get(practice)
+                elif equipment_id is not None:
+                    totals = bucket['equipment'].get(equipment_id)
+                else:
+                    totals = bucket['total']
+                if totals is None:
+                    continue
+                entry = _entry(totals)
+                entry['bucket'] = key
+                if group_by is not None:
+                    entry[group_by] = {label: _entry(t) for label, t in bucket[group_by].items()}
+                series.append(entry)
+            return series
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable copy of the state for snapshots"""
+        with self._lock:
+            return {
+                'totals': {dimension: _copy_totals(labels) for dimension, labels in self.totals.items()},
+                'buckets': {
+                    granularity: {
+                        key: {
+                            'total': list(bucket['total']),
+                            'practice': _copy_totals(bucket['practice']),
+                            'equipment': _copy_totals(bucket['equipment'])
+                        }
+                        for key, bucket in buckets.items()
+                    }
+                    for granularity, buckets in self.buckets.items()
+                }
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CarbonRollups':
+        rollups = cls()
+        rollups.totals = data['totals']
+        rollups.buckets = data['buckets']
+        rollups._keys = {granularity: sorted(buckets) for granularity, buckets in rollups.buckets.items()}
+        return rollups
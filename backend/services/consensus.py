@@ -0,0 +1,148 @@
+"""
+🤝 SMARTMINE CONSENSUS
+Pluggable block sealing and validation rules for the SmartMine blockchain
+- Proof of work: leading-zero hash search (single process or ParallelMiner)
+- Proof of authority: blocks sealed immediately and signed with an
+  authority's Ed25519 key, validated against the trusted authority set
+
+A ledger uses one consensus mode for its whole life; blocks sealed under
+one engine do not validate under another.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+
+
+class ConsensusEngine(ABC):
+    """Interface for sealing and validating blocks"""
+
+    name = 'base'
+
+    @abstractmethod
+    def seal(self, block):
+        """Finalize ``block`` so that validate_header accepts it"""
+
+    @abstractmethod
+    def validate_header(self, header: Dict) -> bool:
+        """Check the consensus rules for a block header (hash already verified)"""
+
+    def get_info(self) -> Dict:
+        """Describe the engine for status endpoints"""
+        return {'type': self.name}
+
+
+class ProofOfWork(ConsensusEngine):
+    """Proof of work: the block hash must start with ``difficulty`` zeros
+
+    New blocks are mined at the engine's ``difficulty``, which is committed
+    in their header; each block is validated against its own recorded
+    difficulty, so changing it between restarts keeps older blocks valid.
+    Blocks claiming less than ``min_difficulty`` are rejected. Blocks sealed
+    before the difficulty was recorded are checked against ``difficulty``.
+    """
+
+    name = 'proof_of_work'
+
+    def __init__(self, difficulty: int = 2, miner=None, min_difficulty: int = 0):
+        self.difficulty = difficulty
+        self.miner = miner
+        self.min_difficulty = min_difficulty
+
+    def seal(self, block):
+        if self.miner is not None:
+            self.miner.mine_block(block, self.difficulty)
+        else:
+            block.mine_block(self.difficulty)
+
+    def validate_header(self, header: Dict) -> bool:
+        difficulty = header.get('difficulty')
+        if difficulty is None:
+            difficulty = self.difficulty
+        elif difficulty < self.min_difficulty:
+            return False
+        return header['hash'].startswith("0" * difficulty)
+
+    def get_info(self) -> Dict:
+        return {
+            'type': self.name,
+            'difficulty': self.difficulty,
+            'min_difficulty': self.min_difficulty,
+            'parallel_workers': self.miner.workers if self.miner is not None else 1
+        }
+
+
+class ProofOfAuthority(ConsensusEngine):
+    """Proof of authority: blocks are signed by a trusted authority key
+
+    Sealing costs one header hash and one Ed25519 signature; there is no
+    nonce search. Nodes that only validate can be given the trusted
+    authorities without a private key.
+    """
+
+    name = 'proof_of_authority'
+
+    def __init__(self, authority_id: str, private_key: Optional[Ed25519PrivateKey] = None,
+                 authorities: Optional[Dict[str, Ed25519PublicKey]] = None):
+        self.authority_id = authority_id
+        self.private_key = private_key
+        self.authorities = dict(authorities or {})
+        if private_key is not None:
+            self.authorities[authority_id] = private_key.public_key()
+
+    @staticmethod
+    def load_private_key(seed_hex: str) -> Ed25519PrivateKey:
+        """Load an Ed25519 private key from its 32-byte hex seed"""
+        return Ed25519PrivateKey.from_private_bytes(bytes.fromhex(seed_hex))
+
+    @staticmethod
+    def load_public_key(public_hex: str) -> Ed25519PublicKey:
+        """Load an Ed25519 public key from its 32-byte hex encoding"""
+        return Ed25519PublicKey.from_public_bytes(bytes.fromhex(public_hex))
+
+    @staticmethod
+    def public_key_hex(public_key: Ed25519PublicKey) -> str:
+        return public_key.public_bytes(
+            encoding=serialization.Encoding.Raw,
+            format=serialization.PublicFormat.Raw
+        ).hex()
+
+    @classmethod
+    def parse_authorities(cls, spec: str) -> Dict[str, Ed25519PublicKey]:
+        """Parse ``"id:pubhex,id2:pubhex"`` into trusted public keys"""
+        authorities = {}
+        for entry in filter(None, (part.strip() for part in spec.split(','))):
+            authority_id, public_hex = entry.split(':', 1)
+            authorities[authority_id] = cls.load_public_key(public_hex)
+        return authorities
+
+    def seal(self, block):
+        if self.private_key is None:
+            raise ValueError(f"Authority {self.authority_id} has no signing key")
+        block.hash = block.calculate_hash()
+        block.signer = self.authority_id
+        block.signature = self.private_key.sign(bytes.fromhex(block.hash)).hex()
+
+    def validate_header(self, header: Dict) -> bool:
+        public_key = self.authorities.get(header.get('signer'))
+        if public_key is None or not header.get('signature'):
+            return False
+        try:
+            public_key.verify(bytes.fromhex(header['signature']), bytes.fromhex(header['hash']))
+        except (InvalidSignature, ValueError):
+            return False
+        return True
+
+    def get_info(self) -> Dict:
+        return {
+            'type': self.name,
+            'authority_id': self.authority_id,
+            'can_seal': self.private_key is not None,
+            'authorities': {
+                authority_id: self.public_key_hex(public_key)
+                for authority_id, public_key in self.authorities.items()
+            }
+        }
@@ -0,0 +1,335 @@
+"""
+🚛 SMARTMINE VECTORIZED FLEET ENGINE
+Struct-of-arrays simulation core for large fleets
+- Truck, crusher and stockpile state lives in typed NumPy arrays
+- One tick advances every entity with vectorized state-machine
+  transitions (same rules and distributions as the dict simulator)
+- Dict views keep the generate_mining_data payload shape
+
+The views are read-only: indexing one builds a fresh dict from the arrays.
+"""
+
+from abc import abstractmethod
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+
+TRUCK_STATUSES = ('loading', 'hauling', 'dumping', 'idle', 'maintenance')
+LOADING, HAULING, DUMPING, IDLE, MAINTENANCE = range(len(TRUCK_STATUSES))
+
+CRUSHER_STATUSES = ('running', 'idle', 'maintenance')
+RUNNING, CRUSHER_IDLE, CRUSHER_MAINTENANCE = range(len(CRUSHER_STATUSES))
+CRUSHER_TYPES = ('Primary', 'Secondary', 'Tertiary')
+
+STOCKPILE_MATERIALS = ('ROM', 'Crushed_Ore', 'Fine_Ore', 'Waste_Rock')
+
+NO_DESTINATION = -1
+
+# Mining area coordinates
+BASE_LAT = -26.2041
+BASE_LNG = 28.0473
+
+
+class EquipmentArrays(Mapping):
+    """Dict-style read access to one kind of equipment stored column-wise"""
+
+    def __init__(self, ids: List[str]):
+        self.ids = ids
+        self._positions = {equipment_id: position for position, equipment_id in enumerate(ids)}
+
+    def __getitem__(self, equipment_id) -> Dict:
+        return self.rows([self._positions[equipment_id]])[0]
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, equipment_id) -> bool:
+        return equipment_id in self._positions
+
+    @abstractmethod
+    def rows(self, positions=None) -> List[Dict]:
+        """Build the dicts for ``positions`` (all entities if None)"""
+
+    def items_where(self, mask: np.ndarray):
+        """Yield ``(id, dict)`` only for entities selected by a boolean mask"""
+        positions = np.flatnonzero(mask)
+        return zip([self.ids[p] for p in positions.tolist()], self.rows(positions))
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """Materialize every entity, keyed by id"""
+        return dict(zip(self.ids, self.rows()))
+
+    def _select(self, positions):
+        if positions is None:
+            return slice(None), self.ids
+        return positions, [self.ids[p] for p in np.asarray(positions).tolist()]
+
+
+class TruckArrays(EquipmentArrays):
+    def __init__(self, count: int, stockpile_ids: List[str], rng: np.random.Generator):
+        super().__init__([f"TRUCK_{i:03d}" for i in range(1, count + 1)])
+        self.stockpile_ids = stockpile_ids
+        self.status = rng.integers(0, len(TRUCK_STATUSES), count).astype(np.int8)
+        self.load_capacity = rng.uniform(200, 300, count)  # tons
+        self.current_load = np.zeros(count)
+        self.lat = BASE_LAT + rng.uniform(-0.01, 0.01, count)
+        self.lng = BASE_LNG + rng.uniform(-0.01, 0.01, count)
+        self.elevation = rng.uniform(1500, 1600, count)
+        self.destination = np.full(count, NO_DESTINATION, dtype=np.int16)
+        self.fuel_level = rng.uniform(30, 100, count)
+        self.engine_hours = rng.uniform(1000, 8000, count)
+        now = datetime.now()
+        self.last_maintenance = [now - timedelta(days=int(days)) for days in rng.integers(1, 31, count)]
+        self.health_score = rng.uniform(75, 95, count)
+        self.speed = np.zeros(count)
+        self.heading = rng.uniform(0, 360, count)
+
+    def rows(self, positions=None) -> List[Dict]:
+        index, ids = self._select(positions)
+        last_maintenance = (self.last_maintenance if positions is None
+                            else [self.last_maintenance[p] for p in np.asarray(positions).tolist()])
+        destinations = [self.stockpile_ids[d] if d >= 0 else None for d in self.destination[index].tolist()]
+        return [
+            {
+                'id': truck_id,
+                'status': TRUCK_STATUSES[status],
+                'load_capacity': load_capacity,
+                'current_load': current_load,
+                'gps_location': {'lat': lat, 'lng': lng, 'elevation': elevation},
+                'destination': destination,
+                'fuel_level': fuel_level,
+                'engine_hours': engine_hours,
+                'last_maintenance': maintained,
+                'health_score': health_score,
+                'speed': speed,
+                'heading': heading
+            }
+            for (truck_id, status, load_capacity, current_load, lat, lng, elevation, destination,
+                 fuel_level, engine_hours, maintained, health_score, speed, heading) in zip(
+                ids, self.status[index].tolist(), self.load_capacity[index].tolist(),
+                self.current_load[index].tolist(), self.lat[index].tolist(), self.lng[index].tolist(),
+                self.elevation[index].tolist(), destinations, self.fuel_level[index].tolist(),
+                self.engine_hours[index].tolist(), last_maintenance, self.health_score[index].tolist(),
+                self.speed[index].tolist(), self.heading[index].tolist())
+        ]
+
+
+class CrusherArrays(EquipmentArrays):
+    def __init__(self, count: int, rng: np.random.Generator):
+        super().__init__([f"CRUSHER_{i}" for i in range(1, count + 1)])
+        self.type = [CRUSHER_TYPES[t] for t in rng.integers(0, len(CRUSHER_TYPES), count).tolist()]
+        self.status = rng.integers(0, len(CRUSHER_STATUSES), count).astype(np.int8)
+        self.throughput_capacity = rng.uniform(800, 1200, count)  # tons/hour
+        self.current_throughput = np.zeros(count)
+        self.power_consumption = rng.uniform(2000, 5000, count)  # kW
+        self.vibration_level = rng.uniform(0.1, 2.0, count)
+        self.temperature = rng.uniform(40, 80, count)
+        self.liner_wear = rng.uniform(10, 80, count)
+        self.oil_pressure = rng.uniform(15, 25, count)
+        self.feed_size = rng.uniform(800, 1200, count)  # mm
+        self.product_size = rng.uniform(0, 150, count)  # mm
+        self.health_score = rng.uniform(70, 95, count)
+        self.availability = rng.uniform(85, 98, count)
+
+    def rows(self, positions=None) -> List[Dict]:
+        index, ids = self._select(positions)
+        types = self.type if positions is None else [self.type[p] for p in np.asarray(positions).tolist()]
+        columns = zip(
+            ids, types, self.status[index].tolist(), self.throughput_capacity[index].tolist(),
+            self.current_throughput[index].tolist(), self.power_consumption[index].tolist(),
+            self.vibration_level[index].tolist(), self.temperature[index].tolist(),
+            self.liner_wear[index].tolist(), self.oil_pressure[index].tolist(),
+            self.feed_size[index].tolist(), self.product_size[index].tolist(),
+            self.health_score[index].tolist(), self.availability[index].tolist()
+        )
+        return [
+            {
+                'id': crusher_id,
+                'type': crusher_type,
+                'status': CRUSHER_STATUSES[status],
+                'throughput_capacity': capacity,
+                'current_throughput': throughput,
+                'power_consumption': power,
+                'vibration_level': vibration,
+                'temperature': temperature,
+                'liner_wear': liner_wear,
+                'oil_pressure': oil_pressure,
+                'feed_size': feed_size,
+                'product_size': product_size,
+                'health_score': health_score,
+                'availability': availability
+            }
+            for (crusher_id, crusher_type, status, capacity, throughput, power, vibration, temperature,
+                 liner_wear, oil_pressure, feed_size, product_size, health_score, availability) in columns
+        ]
+
+
+class StockpileArrays(EquipmentArrays):
+    def __init__(self, rng: np.random.Generator):
+        super().__init__([f"STOCKPILE_{material}" for material in STOCKPILE_MATERIALS])
+        count = len(STOCKPILE_MATERIALS)
+        self.material_type = list(STOCKPILE_MATERIALS)
+        self.current_volume = rng.uniform(5000, 50000, count)  # tons
+        self.max_capacity = rng.uniform(60000, 100000, count)
+        self.min_threshold = rng.uniform(2000, 5000, count)
+        self.max_threshold = rng.uniform(80000, 95000, count)
+        self.fill_rate = np.zeros(count)  # tons/hour
+        self.discharge_rate = np.zeros(count)  # tons/hour
+        self.lat = BASE_LAT + rng.uniform(-0.005, 0.005, count)
+        self.lng = BASE_LNG + rng.uniform(-0.005, 0.005, count)
+        is_ore = np.array(['Ore' in material for material in STOCKPILE_MATERIALS])
+        self.grade = np.where(is_ore, rng.uniform(0.5, 3.5, count), 0)
+        self.moisture_content = rng.uniform(2, 8, count)
+        # ROM and crushed ore feed the crushers
+        self.feeds_crushers = np.array(['ROM' in material or 'Crushed' in material
+                                        for material in STOCKPILE_MATERIALS])
+
+    def rows(self, positions=None) -> List[Dict]:
+        index, ids = self._select(positions)
+        materials = (self.material_type if positions is None
+                     else [self.material_type[p] for p in np.asarray(positions).tolist()])
+        columns = zip(
+            ids, materials, self.current_volume[index].tolist(), self.max_capacity[index].tolist(),
+            self.min_threshold[index].tolist(), self.max_threshold[index].tolist(),
+            self.fill_rate[index].tolist(), self.discharge_rate[index].tolist(),
+            self.lat[index].tolist(), self.lng[index].tolist(),
+            self.grade[index].tolist(), self.moisture_content[index].tolist()
+        )
+        return [
+            {
+                'id': stockpile_id,
+                'material_type': material,
+                'current_volume': volume,
+                'max_capacity': max_capacity,
+                'min_threshold': min_threshold,
+                'max_threshold': max_threshold,
+                'fill_rate': fill_rate,
+                'discharge_rate': discharge_rate,
+                'location': {'lat': lat, 'lng': lng},
+                'grade': grade,
+                'moisture_content': moisture
+            }
+            for (stockpile_id, material, volume, max_capacity, min_threshold, max_threshold,
+                 fill_rate, discharge_rate, lat, lng, grade, moisture) in columns
+        ]
+
+
+class FleetEngine:
+    """Advances every truck, crusher and stockpile once per tick with array operations"""
+
+    def __init__(self, num_trucks: int = 15, num_crushers: int = 3, seed: Optional[int] = None):
+        self.rng = np.random.default_rng(seed)
+        self.stockpiles = StockpileArrays(self.rng)
+        self.trucks = TruckArrays(num_trucks, self.stockpiles.ids, self.rng)
+        self.crushers = CrusherArrays(num_crushers, self.rng)
+
+    def step_trucks(self) -> np.ndarray:
+        """Advance every truck one tick; returns positions of trucks that finished a haul"""
+        trucks, rng = self.trucks, self.rng
+        count = len(trucks)
+        status = trucks.status
+        hauling = status == HAULING
+        loading = status == LOADING
+        dumping = status == DUMPING
+        idle = status == IDLE
+
+        # Hauling: move, maybe arrive and start dumping
+        hauling_positions = np.flatnonzero(hauling)
+        moving = len(hauling_positions)
+        trucks.speed[hauling_positions] = rng.uniform(20, 45, moving)  # km/h
+        trucks.lat[hauling_positions] += rng.uniform(-0.0001, 0.0001, moving)
+        trucks.lng[hauling_positions] += rng.uniform(-0.0001, 0.0001, moving)
+        arrived = hauling_positions[rng.random(moving) < 0.1]
+
+        # Loading: fill up, then head to a random stockpile
+        not_full = loading & (trucks.current_load < trucks.load_capacity)
+        trucks.current_load[not_full] += rng.uniform(5, 15, np.count_nonzero(not_full))
+        departing = np.flatnonzero(loading & ~not_full)
+        trucks.destination[departing] = rng.integers(0, len(self.stockpiles), len(departing))
+
+        # Dumping: unload onto the destination stockpile, then go idle once empty
+        emptied = dumping & (trucks.current_load <= 0)
+        unloading = np.flatnonzero(dumping & ~emptied)
+        dump_amount = np.minimum(trucks.current_load[unloading], rng.uniform(10, 20, len(unloading)))
+        trucks.current_load[unloading] -= dump_amount
+        destinations = trucks.destination[unloading]
+        known = destinations >= 0
+        self.stockpiles.current_volume += np.bincount(
+            destinations[known], weights=dump_amount[known], minlength=len(self.stockpiles))
+
+        # Idle: maybe start a new cycle
+        starting = idle & (rng.random(count) < 0.2)
+
+        status[arrived] = DUMPING
+        status[departing] = HAULING
+        status[emptied] = IDLE
+        trucks.destination[emptied] = NO_DESTINATION
+        status[starting] = LOADING
+
+        # Fuel burn and wear follow the post-transition state
+        burning = np.flatnonzero((status == HAULING) | (status == LOADING))
+        trucks.fuel_level[burning] -= rng.uniform(0.1, 0.5, len(burning))
+        trucks.health_score -= rng.uniform(0, 0.1, count)
+        np.maximum(trucks.health_score, 50, out=trucks.health_score)
+        return arrived
+
+    def step_crushers(self):
+        """Advance every crusher one tick"""
+        crushers, rng = self.crushers, self.rng
+        count = len(crushers)
+        running = np.flatnonzero(crushers.status == RUNNING)
+        idle = np.flatnonzero(crushers.status == CRUSHER_IDLE)
+        active = len(running)
+
+        capacity = crushers.throughput_capacity[running]
+        crushers.current_throughput[running] = rng.uniform(capacity * 0.7, capacity)
+        crushers.power_consumption[running] = rng.uniform(2500, 4800, active)
+        crushers.vibration_level[running] += rng.uniform(-0.1, 0.1, active)
+        crushers.temperature[running] += rng.uniform(-2, 2, active)
+        crushers.liner_wear[running] += rng.uniform(0, 0.1, active)
+        crushers.health_score[running] -= rng.uniform(0, 0.05, active)
+
+        crushers.current_throughput[idle] = 0
+        crushers.power_consumption[idle] = rng.uniform(200, 500, len(idle))
+        crushers.status[idle[rng.random(len(idle)) < 0.1]] = RUNNING
+
+        worn = (crushers.health_score < 70) | (crushers.liner_wear > 75)
+        serviced = worn & (rng.random(count) < 0.05)
+        crushers.status[serviced] = CRUSHER_MAINTENANCE
+        crushers.health_score[serviced] = 95
+        crushers.liner_wear[serviced] = 5
+
+    def step_stockpiles(self):
+        """Update stockpile fill/discharge rates and inventory from trucks and crushers"""
+        stockpiles, trucks, rng = self.stockpiles, self.trucks, self.rng
+        count = len(stockpiles)
+
+        dumping = np.flatnonzero((trucks.status == DUMPING) & (trucks.destination >= 0))
+        fill_rate = np.bincount(trucks.destination[dumping], weights=rng.uniform(50, 100, len(dumping)),
+                                minlength=count)
+        # Each running crusher draws 30-80 t/h from every stockpile feeding crushers
+        running = int(np.count_nonzero(self.crushers.status == RUNNING))
+        discharge_rate = np.where(stockpiles.feeds_crushers,
+                                  rng.uniform(30, 80, (count, running)).sum(axis=1), 0)
+
+        stockpiles.fill_rate = fill_rate
+        stockpiles.discharge_rate = discharge_rate
+        stockpiles.current_volume += (fill_rate - discharge_rate) / 60  # per minute
+        np.clip(stockpiles.current_volume, 0, stockpiles.max_capacity, out=stockpiles.current_volume)
+
+    def tick(self) -> np.ndarray:
+        """Advance the whole site one tick; returns positions of trucks that started dumping"""
+        arrived = self.step_trucks()
+        self.step_crushers()
+        self.step_stockpiles()
+        return arrived
+
+    def count_trucks(self, *statuses: str) -> int:
+        """Number of trucks in any of ``statuses``"""
+        codes = [TRUCK_STATUSES.index(status) for status in statuses]
+        return int(np.count_nonzero(np.isin(self.trucks.status, codes)))
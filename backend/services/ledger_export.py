@@ -0,0 +1,184 @@
+"""
+📤 SMARTMINE LEDGER EXPORT
+Streaming export of blocks and transactions for analysts
+- Generators end to end: one block body in memory at a time
+- NDJSON: one flat JSON object per line
+- Columnar (.smlc): row groups of zlib-compressed JSON columns
+- Optional transaction type, height and time filters
+
+Columnar file layout::
+
+    b'SMLEDGER1\\n'
+    repeated: <4-byte big-endian length> <zlib(JSON {"rows": n, "columns": {name: [values]}})>
+    <4 zero bytes>
+
+A row without a column's field holds null in that column.
+"""
+
+import argparse
+import json
+import struct
+import sys
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.ledger_records import as_dict
+
+EXPORT_FORMATS = ('ndjson', 'columnar')
+EXPORT_KINDS = ('transactions', 'blocks')
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'columnar': 'application/octet-stream'
+}
+FILE_EXTENSIONS = {
+    'ndjson': 'ndjson',
+    'columnar': 'smlc'
+}
+
+COLUMNAR_MAGIC = b'SMLEDGER1\n'
+ROW_GROUP_SIZE = 10000  # rows per columnar row group
+CHUNK_SIZE = 64 * 1024  # bytes per streamed NDJSON chunk
+
+_LENGTH = struct.Struct('>I')
+
+
+def iter_rows(blockchain, kind: str = 'transactions', tx_type: Optional[str] = None,
+              start_height: Optional[int] = None, end_height: Optional[int] = None,
+              start_time: Optional[float] = None, end_time: Optional[float] = None) -> Iterator[Dict]:
+    """Yield export rows for a height and/or time range
+
+    Transaction rows are the transaction's fields plus ``block_index`` and
+    ``position``. Block rows are the header plus the block's transactions
+    (only those of ``tx_type`` if given; blocks without any are skipped).
+    Bodies pruned without an archive are skipped.
+    """
+    if kind not in EXPORT_KINDS:
+        raise ValueError(f"Unknown export kind '{kind}' (expected one of {', '.join(EXPORT_KINDS)})")
+
+    for block, transactions in blockchain.iter_blocks(start_height, end_height, start_time, end_time):
+        if transactions is None:
+            continue
+        if kind == 'blocks':
+            bodies = [as_dict(tx) for tx in transactions if tx_type is None or tx.get('type') == tx_type]
+            if tx_type is not None and not bodies:
+                continue
+            row = block.get_header()
+            row['transactions'] = bodies
+            yield row
+            continue
+        for position, tx in enumerate(transactions):
+            if tx_type is not None and tx.get('type') != tx_type:
+                continue
+            row = {'block_index': block.index, 'position': position}
+            row.update(as_dict(tx))
+            yield row
+
+
+def iter_ndjson(rows: Iterable[Dict], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Encode rows as NDJSON, yielding chunks of about ``chunk_size`` bytes"""
+    buffer = []
+    buffered = 0
+    for row in rows:
+        line = json.dumps(row, default=str).encode() + b'\n'
+        buffer.append(line)
+        buffered += len(line)
+        if buffered >= chunk_size:
+            yield b''.join(buffer)
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def _encode_row_group(group) -> bytes:
+    columns = {}
+    for index, row in enumerate(group):
+        for key, value in row.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [None] * len(group)
+            column[index] = value
+    payload = zlib.compress(json.dumps({'rows': len(group), 'columns': columns}, default=str).encode())
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def iter_columnar(rows: Iterable[Dict], row_group_size: int = ROW_GROUP_SIZE) -> Iterator[bytes]:
+    """Encode rows in the columnar format, yielding one row group at a time"""
+    yield COLUMNAR_MAGIC
+    group = []
+    for row in rows:
+        group.append(row)
+        if len(group) == row_group_size:
+            yield _encode_row_group(group)
+            group = []
+    if group:
+        yield _encode_row_group(group)
+    yield _LENGTH.pack(0)
+
+
+def read_columnar(stream: BinaryIO) -> Iterator[Dict]:
+    """Read a columnar export, yielding ``{column: [values]}`` per row group"""
+    if stream.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise ValueError("Not a SmartMine columnar ledger export")
+    while True:
+        header = stream.read(_LENGTH.size)
+        if len(header) != _LENGTH.size:
+            raise ValueError("Truncated columnar ledger export")
+        length, = _LENGTH.unpack(header)
+        if length == 0:
+            return
+        payload = stream.read(length)
+        if len(payload) != length:
+            raise ValueError("Truncated columnar ledger export")
+        yield json.loads(zlib.decompress(payload))['columns']
+
+
+def export_ledger(blockchain, fmt: str = 'ndjson', kind: str = 'transactions',
+                  tx_type: Optional[str] = None, start_height: Optional[int] = None,
+                  end_height: Optional[int] = None, start_time: Optional[float] = None,
+                  end_time: Optional[float] = None) -> Iterator[bytes]:
+    """Stream an export of the ledger as byte chunks"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}' (expected one of {', '.join(EXPORT_FORMATS)})")
+    if kind not in EXPORT_KINDS:
+        raise ValueError(f"Unknown export kind '{kind}' (expected one of {', '.join(EXPORT_KINDS)})")
+
+    rows = iter_rows(blockchain, kind, tx_type, start_height, end_height, start_time, end_time)
+    return iter_ndjson(rows) if fmt == 'ndjson' else iter_columnar(rows)
+
+
+def export_to_file(blockchain, path, fmt: str = 'ndjson', **filters) -> int:
+    """Write an export to ``path``; returns the number of bytes written"""
+    written = 0
+    with open(path, 'wb') as f:
+        for chunk in export_ledger(blockchain, fmt, **filters):
+            f.write(chunk)
+            written += len(chunk)
+    return written
+
+
+def main():
+    """Export the local ledger to a file"""
+    parser = argparse.ArgumentParser(description='Export the SmartMine ledger')
+    parser.add_argument('output', help='destination file')
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default='ndjson')
+    parser.add_argument('--kind', choices=EXPORT_KINDS, default='transactions')
+    parser.add_argument('--type', dest='tx_type', help='only transactions of this type')
+    parser.add_argument('--from-height', type=int)
+    parser.add_argument('--to-height', type=int)
+    args = parser.parse_args()
+
+    from services.blockchain_service import smartmine_blockchain
+
+    written = export_to_file(smartmine_blockchain, args.output, args.format, kind=args.kind,
+                             tx_type=args.tx_type, start_height=args.from_height,
+                             end_height=args.to_height)
+    print(f"📤 Exported {args.kind} to {args.output} ({written:,} bytes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,341 @@
+"""
+🧱 SMARTMINE LEDGER RECORDS
+Compact in-memory representation of blockchain transactions
+- Slotted record class per transaction type, read like a dict
+- Interned enumerations for transaction type, operator and material
+- Columnar per-block storage: small-int enum codes, packed timestamps,
+  16-byte UUIDs, raw-byte keys and signatures and one list per field
+  instead of one dict per transaction
+
+Every encoding is lossless: a transaction materialized from columns
+serializes (and therefore hashes) exactly like the dict it was built from.
+"""
+
+import sys
+import threading
+import uuid
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+# Marks a field a transaction does not have
+MISSING = object()
+
+# Shared stand-ins for empty containers; materialized as fresh objects
+EMPTY_DICT = object()
+EMPTY_LIST = object()
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_TIMESTAMP_MISSING = -2 ** 63
+_TIMESTAMP_RAW = -2 ** 63 + 1
+
+
+class Interner:
+    """Two-way mapping between strings and small integer codes (0 = not interned)
+
+    Shared by every thread that builds records; lookups are lock-free and
+    new codes are assigned under a lock.
+    """
+
+    MAX_CODES = 65535
+
+    def __init__(self, *values: str):
+        self._codes = {}
+        self._values = [None]
+        self._lock = threading.Lock()
+        for value in values:
+            self.code(value)
+
+    def code(self, value) -> int:
+        """Get the code for ``value``, assigning one if there is room"""
+        if not isinstance(value, str):
+            return 0
+        code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)
+                if code is None:
+                    if len(self._values) > self.MAX_CODES:
+                        return 0
+                    code = len(self._values)
+                    # Value first: a code is only published once value() can resolve it
+                    self._values.append(sys.intern(value))
+                    self._codes[value] = code
+        return code
+
+    def value(self, code: int) -> str:
+        return self._values[code]
+
+    def intern(self, value):
+        """Return the shared interned copy of ``value`` when it has a code"""
+        code = self.code(value)
+        return self._values[code] if code else value
+
+
+TRANSACTION_TYPES = Interner(
+    'genesis', 'equipment_registration', 'maintenance_record',
+    'supply_chain', 'carbon_credit', 'safety_incident'
+)
+OPERATORS = Interner('SmartMine_System')
+MATERIALS = Interner(
+    'ore', 'iron_ore', 'coal', 'copper_ore', 'limestone', 'gold_ore',
+    'ROM', 'Crushed_Ore', 'Fine_Ore', 'Waste_Rock'
+)
+
+# Fields stored as enum codes
+ENUM_FIELDS = {
+    'type': TRANSACTION_TYPES,
+    'operator': OPERATORS,
+    'material_type': MATERIALS
+}
+
+# Fields that normally hold canonical UUID strings (stored as 16 bytes)
+UUID_FIELDS = ('id', 'shipment_id', 'credit_id', 'incident_id')
+
+# Fields that normally hold lowercase hex (stored as raw bytes)
+HEX_FIELDS = ('public_key', 'signature')
+
+
+def as_dict(transaction) -> Dict:
+    """Get a plain dict for a transaction record or dict"""
+    return transaction if isinstance(transaction, dict) else transaction.to_dict()
+
+
+class TransactionRecord:
+    """Slotted transaction with dict-style read access
+
+    Fields the transaction does not have hold MISSING; keys outside the
+    type's schema are kept in ``extra``.
+    """
+
+    TYPE = None
+    FIELDS = ('type', 'id', 'timestamp', 'operator', 'public_key', 'signature')
+    __slots__ = FIELDS + ('extra',)
+
+    def __init__(self, data: Dict):
+        field_set = self._field_set
+        for field in self.FIELDS:
+            value = data.get(field, MISSING)
+            if field in ENUM_FIELDS:
+                value = ENUM_FIELDS[field].intern(value)
+            setattr(self, field, value)
+        extra = {key: value for key, value in data.items() if key not in field_set}
+        self.extra = extra or None
+
+    def __getitem__(self, key):
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        if key in self._field_set:
+            value = getattr(self, key)
+        elif self.extra is not None:
+            value = self.extra.get(key, MISSING)
+        else:
+            value = MISSING
+        return default if value is MISSING else value
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, MISSING) is not MISSING
+
+    def items(self):
+        for field in self.FIELDS:
+            value = getattr(self, field)
+            if value is not MISSING:
+                yield field, value
+        if self.extra is not None:
+            yield from self.extra.items()
+
+    def keys(self):
+        return [key for key, _ in self.items()]
+
+    def to_dict(self) -> Dict:
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+def _record_class(name: str, tx_type: str, fields: tuple) -> type:
+    return type(name, (TransactionRecord,), {
+        'TYPE': tx_type,
+        'FIELDS': TransactionRecord.FIELDS + fields,
+        '__slots__': fields
+    })
+
+
+GenericTransaction = _record_class('GenericTransaction', None, ())
+EquipmentRegistration = _record_class('EquipmentRegistration', 'equipment_registration', (
+    'equipment_id', 'manufacturer', 'model', 'serial_number', 'purchase_date',
+    'specifications', 'warranty_info'
+))
+MaintenanceRecord = _record_class('MaintenanceRecord', 'maintenance_record', (
+    'equipment_id', 'maintenance_type', 'description', 'technician', 'parts_used',
+    'cost', 'duration_hours', 'next_maintenance_due'
+))
+SupplyChainShipment = _record_class('SupplyChainShipment', 'supply_chain', (
+    'shipment_id', 'material_type', 'quantity', 'source_location', 'destination',
+    'truck_id', 'quality_metrics', 'environmental_impact'
+))
+CarbonCredit = _record_class('CarbonCredit', 'carbon_credit', (
+    'credit_id', 'co2_reduction_tons', 'green_practice', 'verification_agency',
+    'credit_value_usd', 'valid_until', 'equipment_id'
+))
+SafetyIncident = _record_class('SafetyIncident', 'safety_incident', (
+    'incident_id', 'severity', 'description', 'location', 'equipment_involved',
+    'personnel_involved', 'corrective_actions', 'investigation_status'
+))
+
+RECORD_TYPES = {
+    cls.TYPE: cls
+    for cls in (EquipmentRegistration, MaintenanceRecord, SupplyChainShipment, CarbonCredit, SafetyIncident)
+}
+
+for _cls in (GenericTransaction,) + tuple(RECORD_TYPES.values()):
+    _cls._field_set = frozenset(_cls.FIELDS)
+
+
+def make_record(transaction) -> TransactionRecord:
+    """Build the slotted record for a transaction dict (records pass through)"""
+    if isinstance(transaction, TransactionRecord):
+        return transaction
+    return RECORD_TYPES.get(transaction.get('type'), GenericTransaction)(transaction)
+
+
+def _encode_timestamp(value) -> int:
+    if isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return _TIMESTAMP_RAW
+        if parsed.tzinfo is None and parsed.isoformat() == value:
+            return (parsed - _EPOCH) // _MICROSECOND
+    return _TIMESTAMP_RAW
+
+
+def _encode_uuid(value):
+    if isinstance(value, str) and len(value) == 36:
+        try:
+            encoded = uuid.UUID(value)
+        except ValueError:
+            return value
+        if str(encoded) == value:
+            return encoded.bytes
+    return value
+
+
+def _encode_hex(value):
+    if isinstance(value, str):
+        try:
+            encoded = bytes.fromhex(value)
+        except ValueError:
+            return value
+        if encoded.hex() == value:
+            return encoded
+    return value
+
+
+def _encode_value(value):
+    if value == {} and isinstance(value, dict):
+        return EMPTY_DICT
+    if value == [] and isinstance(value, list):
+        return EMPTY_LIST
+    return value
+
+
+def _decode_value(value):
+    if value is EMPTY_DICT:
+        return {}
+    if value is EMPTY_LIST:
+        return []
+    return value
+
+
+class TransactionColumns:
+    """Columnar storage for one block's transactions
+
+    Behaves as a read-only sequence of TransactionRecord rows.
+    """
+
+    __slots__ = ('_count', '_enums', '_timestamps', '_fields')
+
+    def __init__(self, transactions):
+        transactions = list(transactions)
+        count = len(transactions)
+        self._count = count
+        self._enums = {name: array('H', bytes(2 * count)) for name in ENUM_FIELDS}
+        self._timestamps = array('q', [_TIMESTAMP_MISSING]) * count
+        self._fields = {}
+
+        for position, transaction in enumerate(transactions):
+            for key, value in transaction.items():
+                if key in ENUM_FIELDS:
+                    code = ENUM_FIELDS[key].code(value)
+                    if code:
+                        self._enums[key][position] = code
+                        continue
+                elif key == 'timestamp':
+                    encoded = _encode_timestamp(value)
+                    self._timestamps[position] = encoded
+                    if encoded != _TIMESTAMP_RAW:
+                        continue
+                elif key in UUID_FIELDS:
+                    value = _encode_uuid(value)
+                elif key in HEX_FIELDS:
+                    value = _encode_hex(value)
+
+                column = self._fields.get(key)
+                if column is None:
+                    column = self._fields[key] = [MISSING] * count
+                column[position] = _encode_value(value)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def row(self, position: int) -> Dict:
+        """Materialize the transaction at ``position`` as a plain dict"""
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError(position)
+
+        data = {}
+        for name, codes in self._enums.items():
+            code = codes[position]
+            if code:
+                data[name] = ENUM_FIELDS[name].value(code)
+        timestamp = self._timestamps[position]
+        if timestamp not in (_TIMESTAMP_MISSING, _TIMESTAMP_RAW):
+            data['timestamp'] = (_EPOCH + timestamp * _MICROSECOND).isoformat()
+        for key, column in self._fields.items():
+            value = column[position]
+            if value is MISSING:
+                continue
+            if isinstance(value, bytes):
+                if key in UUID_FIELDS:
+                    value = str(uuid.UUID(bytes=value))
+                elif key in HEX_FIELDS:
+                    value = value.hex()
+            data[key] = _decode_value(value)
+        return data
+
+    def __getitem__(self, position: int) -> TransactionRecord:
+        return make_record(self.row(position))
+
+    def __iter__(self) -> Iterator[TransactionRecord]:
+        for position in range(self._count):
+            yield make_record(self.row(position))
+
+    def to_dicts(self) -> List[Dict]:
+        """Materialize every transaction as a plain dict"""
+        return [self.row(position) for position in range(self._count)]
+
+
+def to_columns(transactions) -> Optional[TransactionColumns]:
+    """Store transactions column-wise (None stays None for pruned blocks)"""
+    if transactions is None or isinstance(transactions, TransactionColumns):
+        return transactions
+    return TransactionColumns(transactions)
@@ -0,0 +1,183 @@
+"""
+📥 SMARTMINE MEMPOOL
+Bounded transaction queue with automatic block sealing
+- Seals a block when it reaches N transactions or its oldest transaction
+  has waited T milliseconds
+- Rejects or blocks (backpressure) submitters when full
+- Queue depth and seal latency metrics
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+
+class MempoolFullError(Exception):
+    """Raised when a transaction cannot be queued because the mempool is full"""
+
+
+class Mempool:
+    """Bounded pending-transaction queue sealed into blocks by a background thread"""
+
+    FULL_POLICIES = ('reject', 'block')
+
+    def __init__(self, blockchain, max_block_transactions: int = 500, max_block_age_ms: float = 2000,
+                 capacity: int = 10000, full_policy: str = 'reject', block_timeout: Optional[float] = None):
+        if full_policy not in self.FULL_POLICIES:
+            raise ValueError(f"full_policy must be one of {self.FULL_POLICIES}")
+
+        self.blockchain = blockchain
+        self.max_block_transactions = max_block_transactions
+        self.max_block_age = max_block_age_ms / 1000
+        self.capacity = capacity
+        self.full_policy = full_policy
+        self.block_timeout = block_timeout
+
+        # (enqueue time, transaction)
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._seal_lock = threading.Lock()
+        self._thread = None
+        self._running = False
+
+        # Metrics
+        self.submitted = 0
+        self.rejected = 0
+        self.max_depth = 0
+        self.sealed_blocks = 0
+        self.sealed_transactions = 0
+        self.last_seal_latency_ms = 0.0
+        self.max_seal_latency_ms = 0.0
+        self._total_seal_latency_ms = 0.0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def submit(self, transaction: Dict, wait: bool = True):
+        """Queue a transaction, applying the full policy if at capacity
+
+        With ``wait=False`` a full mempool raises MempoolFullError at once,
+        even under the 'block' policy (for callers such as the event loop).
+        """
+        with self._condition:
+            if len(self._queue) >= self.capacity:
+                if self.full_policy == 'block' and wait:
+                    self._condition.wait_for(lambda: len(self._queue) < self.capacity,
+                                             timeout=self.block_timeout)
+                if len(self._queue) >= self.capacity:
+                    self.rejected += 1
+                    raise MempoolFullError(f"Mempool full ({self.capacity} transactions)")
+
+            self._queue.append((time.time(), transaction))
+            self.submitted += 1
+            self.max_depth = max(self.max_depth, len(self._queue))
+            # Wake the sealer to start the age timer or seal a full block
+            if len(self._queue) == 1 or len(self._queue) >= self.max_block_transactions:
+                self._condition.notify_all()
+
+    def pending(self) -> List[Dict]:
+        """Get a copy of the queued transactions"""
+        with self._condition:
+            return [tx for _, tx in self._queue]
+
+    def _take_batch(self) -> List:
+        with self._condition:
+            count = min(len(self._queue), self.max_block_transactions)
+            batch = [self._queue.popleft() for _ in range(count)]
+            # Wake submitters waiting for space
+            self._condition.notify_all()
+            return batch
+
+    def _seal(self, batch: List) -> bool:
+        if not batch:
+            return False
+        try:
+            self.blockchain.seal_block([tx for _, tx in batch])
+        except Exception:
+            # Put the batch back so it goes into the next block
+            with self._condition:
+                self._queue.extendleft(reversed(batch))
+            raise
+
+        latency_ms = (time.time() - batch[0][0]) * 1000
+        self.sealed_blocks += 1
+        self.sealed_transactions += len(batch)
+        self.last_seal_latency_ms = latency_ms
+        self.max_seal_latency_ms = max(self.max_seal_latency_ms, latency_ms)
+        self._total_seal_latency_ms += latency_ms
+        return True
+
+    def flush(self) -> bool:
+        """Seal everything queued right now; returns True if a block was sealed"""
+        sealed = False
+        with self._seal_lock:
+            while self._queue:
+                sealed = self._seal(self._take_batch()) or sealed
+        return sealed
+
+    def _ready(self) -> bool:
+        if not self._running:
+            return True
+        if len(self._queue) >= self.max_block_transactions:
+            return True
+        return bool(self._queue) and time.time() - self._queue[0][0] >= self.max_block_age
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._ready():
+                    timeout = None
+                    if self._queue:
+                        timeout = max(0, self._queue[0][0] + self.max_block_age - time.time())
+                    self._condition.wait(timeout)
+                if not self._running:
+                    return
+
+            try:
+                with self._seal_lock:
+                    if self._ready():
+                        self._seal(self._take_batch())
+            except Exception as e:
+                print(f"⚠️ Mempool failed to seal block: {e}")
+                time.sleep(min(1.0, self.max_block_age))
+
+    def start(self):
+        """Start the background sealing thread"""
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='mempool-sealer', daemon=True)
+        self._thread.start()
+
+    def stop(self, flush: bool = True):
+        """Stop the sealing thread, optionally sealing what is still queued"""
+        if self._thread is not None:
+            with self._condition:
+                self._running = False
+                self._condition.notify_all()
+            self._thread.join()
+            self._thread = None
+        if flush:
+            self.flush()
+
+    def get_metrics(self) -> Dict:
+        """Get queue depth and seal latency metrics"""
+        with self._condition:
+            depth = len(self._queue)
+            oldest_age_ms = (time.time() - self._queue[0][0]) * 1000 if self._queue else 0
+        return {
+            'queue_depth': depth,
+            'max_queue_depth': self.max_depth,
+            'capacity': self.capacity,
+            'full_policy': self.full_policy,
+            'oldest_transaction_age_ms': oldest_age_ms,
+            'submitted': self.submitted,
+            'rejected': self.rejected,
+            'sealed_blocks': self.sealed_blocks,
+            'sealed_transactions': self.sealed_transactions,
+            'average_block_size': self.sealed_transactions / self.sealed_blocks if self.sealed_blocks else 0,
+            'last_seal_latency_ms': self.last_seal_latency_ms,
+            'max_seal_latency_ms': self.max_seal_latency_ms,
+            'average_seal_latency_ms': self._total_seal_latency_ms / self.sealed_blocks if self.sealed_blocks else 0
+        }
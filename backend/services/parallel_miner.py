@@ -0,0 +1,126 @@
+"""
+⛏️ SMARTMINE PARALLEL MINER
+Multi-core proof-of-work nonce search for SmartMine blocks
+- Nonce space split across a process pool
+- First valid hash cancels the remaining workers
+- Configurable worker count and timeout
+
+Workers only receive the encoded header prefix, so this module has no
+dependency on the blockchain service and is safe to import in freshly
+spawned worker processes.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import struct
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+# Nonce encoding appended to the block header prefix
+NONCE = struct.Struct('<Q')
+
+# Hashes between checks of the stop flag and deadline
+CHECK_INTERVAL = 4096
+
+_stop_event = None
+
+
+def _init_worker(stop_event):
+    global _stop_event
+    _stop_event = stop_event
+
+
+def search_nonces(prefix: bytes, target: str, start: int, step: int,
+                  deadline: Optional[float] = None) -> Tuple[Optional[int], Optional[str], int]:
+    """Search nonces ``start, start + step, ...`` for a hash beginning with ``target``
+
+    Returns ``(nonce, hash, attempts)``; nonce and hash are None if the
+    search was stopped or timed out first.
+    """
+    prefix_hash = hashlib.sha256(prefix)
+    pack_nonce = NONCE.pack
+    nonce = start
+    attempts = 0
+    while True:
+        for _ in range(CHECK_INTERVAL):
+            attempt = prefix_hash.copy()
+            attempt.update(pack_nonce(nonce))
+            block_hash = attempt.hexdigest()
+            attempts += 1
+            if block_hash.startswith(target):
+                if _stop_event is not None:
+                    _stop_event.set()
+                return nonce, block_hash, attempts
+            nonce += step
+        if _stop_event is not None and _stop_event.is_set():
+            return None, None, attempts
+        if deadline is not None and time.time() > deadline:
+            return None, None, attempts
+
+
+class ParallelMiner:
+    """Process-pool proof-of-work miner"""
+
+    def __init__(self, workers: Optional[int] = None, timeout: Optional[float] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.last_attempts = 0
+        self.last_duration = 0.0
+
+        self._stop_event = multiprocessing.Event()
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self._stop_event,)
+            )
+        return self._executor
+
+    def mine_block(self, block, difficulty: int):
+        """Record ``difficulty`` in ``block`` and set a valid nonce and hash
+
+        Raises TimeoutError if no worker finds a nonce within the timeout.
+        """
+        block.difficulty = difficulty
+        prefix = block.get_header_prefix()
+        target = "0" * difficulty
+        deadline = time.time() + self.timeout if self.timeout is not None else None
+
+        with self._lock:
+            start = time.time()
+            self._stop_event.clear()
+            executor = self._get_executor()
+            futures = [
+                executor.submit(search_nonces, prefix, target, worker, self.workers, deadline)
+                for worker in range(self.workers)
+            ]
+
+            found = None
+            attempts = 0
+            for future in futures:
+                nonce, block_hash, worker_attempts = future.result()
+                attempts += worker_attempts
+                if nonce is not None and (found is None or nonce < found[0]):
+                    found = (nonce, block_hash)
+
+            self.last_attempts = attempts
+            self.last_duration = time.time() - start
+
+        if found is None:
+            raise TimeoutError(f"No nonce found for block {block.index} within {self.timeout}s")
+
+        block.nonce, block.hash = found
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._stop_event.set()
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,392 @@
+"""
+🛰️ SMARTMINE REPLICATION
+Peer-to-peer chain replication between SmartMine site servers
+- HTTP peer protocol: chain status, header ranges, block ranges
+- Headers-first sync: fork point by binary search, header chain validated
+  before any body is downloaded
+- Block bodies fetched in parallel batches across peers and checked
+  against the validated headers (Merkle root, no repeated transaction ids)
+- Longest valid chain wins; reorganizations re-queue orphaned transactions
+- Incremental catch-up by height on a background interval
+
+Run a standalone node (e.g. several on one machine):
+    python services/replication.py --port 8771 --peers http://localhost:8770
+"""
+
+import argparse
+import http.client
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+import config
+from services.blockchain_service import (
+    MiningBlock, SmartMineBlockchain, compute_merkle_root, hash_transaction, smartmine_blockchain
+)
+
+# Largest range a peer serves per request
+MAX_HEADERS_PER_REQUEST = 2000
+MAX_BLOCKS_PER_REQUEST = 500
+
+
+def _repeats_transaction_id(transactions: List[Dict], seen: set) -> bool:
+    """Check whether a transaction id repeats, within ``transactions`` or from ``seen``
+
+    ``seen`` collects the ids checked so far, so one set spans a whole batch.
+    """
+    for tx in transactions:
+        tx_id = tx.get('id')
+        if tx_id is None:
+            continue
+        if tx_id in seen:
+            return True
+        seen.add(tx_id)
+    return False
+
+
+class PeerServer:
+    """Serve this node's chain to peers over HTTP"""
+
+    def __init__(self, blockchain: SmartMineBlockchain, host: str = 'localhost', port: int = 8770):
+        self.blockchain = blockchain
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def _handle(self, path: str, query: Dict) -> Optional[Dict]:
+        start = int(query.get('start', ['0'])[0])
+        if path == '/chain/status':
+            view = self.blockchain.get_view()
+            return {'height': view.height, 'latest_hash': view.latest_hash,
+                    'consensus': self.blockchain.consensus.get_info()}
+        if path == '/chain/headers':
+            count = min(int(query.get('count', [MAX_HEADERS_PER_REQUEST])[0]), MAX_HEADERS_PER_REQUEST)
+            page = self.blockchain.get_blocks(start_height=start, limit=count)
+            return {'headers': page['blocks']}
+        if path == '/chain/blocks':
+            count = min(int(query.get('count', [MAX_BLOCKS_PER_REQUEST])[0]), MAX_BLOCKS_PER_REQUEST)
+            page = self.blockchain.get_blocks(start_height=start, limit=count, include_transactions=True)
+            return {'blocks': page['blocks']}
+        return None
+
+    def start(self):
+        """Start serving in a background thread"""
+        peer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                try:
+                    body = peer._handle(url.path, parse_qs(url.query))
+                    status = 200 if body is not None else 404
+                    if body is None:
+                        body = {'error': 'Not found'}
+                except ValueError as e:
+                    status, body = 400, {'error': str(e)}
+                except Exception as e:
+                    status, body = 500, {'error': str(e)}
+                payload = json.dumps(body, separators=(',', ':')).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='peer-server', daemon=True)
+        self._thread.start()
+        print(f"🛰️ Peer server listening on http://{self.host}:{self.port}")
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+
+class PeerClient:
+    """Client for one peer; keeps a persistent connection per thread"""
+
+    def __init__(self, url: str, timeout: float = 30.0):
+        self.url = url.rstrip('/')
+        parsed = urlparse(self.url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _get(self, path: str) -> Dict:
+        for attempt in range(2):
+            connection = getattr(self._local, 'connection', None)
+            if connection is None:
+                connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+                self._local.connection = connection
+            try:
+                connection.request('GET', path)
+                response = connection.getresponse()
+                body = json.loads(response.read())
+            except (http.client.HTTPException, OSError):
+                # Stale keep-alive connection; reconnect once
+                connection.close()
+                self._local.connection = None
+                if attempt:
+                    raise
+                continue
+            if response.status != 200:
+                raise ConnectionError(f"{self.url}{path}: {body.get('error', response.status)}")
+            return body
+
+    def status(self) -> Dict:
+        return self._get('/chain/status')
+
+    def headers(self, start: int, count: int) -> List[Dict]:
+        return self._get(f'/chain/headers?start={start}&count={count}')['headers']
+
+    def blocks(self, start: int, count: int) -> List[Dict]:
+        return self._get(f'/chain/blocks?start={start}&count={count}')['blocks']
+
+
+class ChainSyncer:
+    """Keep a blockchain in sync with the longest valid chain among its peers"""
+
+    def __init__(self, blockchain: SmartMineBlockchain, peers: List[str], fetch_workers: int = 4,
+                 header_batch: int = MAX_HEADERS_PER_REQUEST, body_batch: int = 200,
+                 timeout: float = 30.0):
+        self.blockchain = blockchain
+        self.peers = [PeerClient(url, timeout) for url in peers]
+        self.fetch_workers = fetch_workers
+        self.header_batch = header_batch
+        self.body_batch = body_batch
+        self.last_result = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._sync_lock = threading.Lock()
+
+    def _validate_headers(self, headers: List[Dict], parent: Optional[Dict]) -> bool:
+        """Check that headers form a valid chain on top of ``parent``"""
+        consensus = self.blockchain.consensus
+        for header in headers:
+            if parent is None:
+                # Genesis is not sealed; it only has to be well formed
+                if header['index'] != 0 or header['previous_hash'] != "0":
+                    return False
+            elif (header['index'] != parent['index'] + 1 or
+                    header['previous_hash'] != parent['hash'] or
+                    header['timestamp'] < parent['timestamp'] or
+                    not consensus.validate_header(header)):
+                return False
+            if MiningBlock.hash_header(header) != header['hash']:
+                return False
+            parent = header
+        return True
+
+    def _find_fork_point(self, peer: PeerClient, peer_height: int) -> int:
+        """Highest height where our chain and the peer's agree (-1 if not even genesis)"""
+        chain = self.blockchain.chain
+        low, high = -1, min(self.blockchain.get_view().height, peer_height)
+        # Common case first: the peer extends our chain
+        if peer.headers(high, 1)[0]['hash'] == chain[high].hash:
+            return high
+        high -= 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if peer.headers(middle, 1)[0]['hash'] == chain[middle].hash:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def _fetch_headers(self, peer: PeerClient, fork_height: int, peer_height: int) -> List[Dict]:
+        parent = self.blockchain.chain[fork_height].get_header() if fork_height >= 0 else None
+        headers = []
+        start = fork_height + 1
+        while start <= peer_height:
+            batch = peer.headers(start, min(self.header_batch, peer_height - start + 1))
+            if not batch:
+                raise ConnectionError(f"{peer.url} returned no headers from {start}")
+            if not self._validate_headers(batch, parent):
+                raise ValueError(f"{peer.url} served an invalid header chain at {start}")
+            headers.extend(batch)
+            parent = batch[-1]
+            start += len(batch)
+        return headers
+
+    def _fetch_bodies(self, sources: List[PeerClient], headers: List[Dict], offset: int) -> List[MiningBlock]:
+        """Fetch and check the bodies for one batch of validated headers"""
+        count = len(headers)
+        start = headers[0]['index']
+        last_error = None
+        # Spread batches across peers; fall back to the others on failure
+        for attempt in range(len(sources)):
+            peer = sources[(offset + attempt) % len(sources)]
+            try:
+                data = peer.blocks(start, count)
+            except (ConnectionError, OSError, ValueError) as e:
+                last_error = e
+                continue
+            if len(data) != count:
+                last_error = ValueError(f"{peer.url} returned {len(data)} of {count} blocks from {start}")
+                continue
+            blocks = []
+            seen = set()
+            for header, block_data in zip(headers, data):
+                transactions = block_data.get('transactions')
+                if (block_data['hash'] != header['hash'] or transactions is None or
+                        _repeats_transaction_id(transactions, seen) or
+                        compute_merkle_root([hash_transaction(tx) for tx in transactions]) != header['merkle_root']):
+                    blocks = None
+                    break
+                # Rebuild the Bloom filter locally rather than trusting the peer's
+                block_data.pop('bloom', None)
+                blocks.append(MiningBlock.from_dict(block_data))
+            if blocks is not None:
+                return blocks
+            last_error = ValueError(f"{peer.url} served bodies that do not match their headers or repeat transaction ids at {start}")
+        raise last_error
+
+    def sync(self) -> Dict:
+        """Catch up with the best peer once
+
+        Returns a summary: the peer synced from, the fork point, blocks
+        adopted and catch-up throughput.
+        """
+        with self._sync_lock:
+            started = time.time()
+            statuses = []
+            for peer in self.peers:
+                try:
+                    statuses.append((peer.status()['height'], peer))
+                except (ConnectionError, OSError, ValueError):
+                    continue
+
+            our_height = self.blockchain.get_view().height
+            result = {'peer': None, 'fork_height': our_height, 'imported': 0,
+                      'reorganized': False, 'seconds': 0.0, 'blocks_per_second': 0.0}
+            # Longest chain first; fall through to the next peer if one is invalid
+            for peer_height, peer in sorted(statuses, key=lambda status: -status[0]):
+                if peer_height <= our_height:
+                    break
+                try:
+                    fork_height = self._find_fork_point(peer, peer_height)
+                    headers = self._fetch_headers(peer, fork_height, peer_height)
+                    imported = self._import(statuses, peer, fork_height, headers)
+                except (ConnectionError, OSError, ValueError) as e:
+                    print(f"⚠️ Sync from {peer.url} failed: {e}")
+                    continue
+                result.update(peer=peer.url, fork_height=fork_height, imported=imported,
+                              reorganized=bool(imported) and fork_height < our_height)
+                break
+
+            result['seconds'] = time.time() - started
+            if result['imported']:
+                result['blocks_per_second'] = result['imported'] / result['seconds']
+            self.last_result = result
+            return result
+
+    def _import(self, statuses: List, peer: PeerClient, fork_height: int, headers: List[Dict]) -> int:
+        """Download bodies in parallel and hand them to the blockchain in order"""
+        tip = headers[-1]['index']
+        sources = [peer] + [other for height, other in statuses if other is not peer and height >= tip]
+        batches = [headers[i:i + self.body_batch] for i in range(0, len(headers), self.body_batch)]
+
+        imported = 0
+        extends_tip = fork_height == self.blockchain.get_view().height
+        pending = []
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+            # map() yields in order while later batches download concurrently
+            for blocks in executor.map(self._fetch_bodies, [sources] * len(batches), batches, range(len(batches))):
+                if extends_tip:
+                    # Incremental catch-up: each batch becomes visible as it lands
+                    imported += self.blockchain.import_blocks(fork_height + imported, blocks)
+                else:
+                    pending.extend(blocks)
+        if pending:
+            # A fork is only adopted once the whole longer chain has been checked
+            imported = self.blockchain.import_blocks(fork_height, pending)
+        return imported
+
+    def _run(self, interval: float):
+        while not self._stop_event.is_set():
+            try:
+                result = self.sync()
+                if result['imported']:
+                    print(f"🛰️ Synced {result['imported']} blocks from {result['peer']} "
+                          f"({result['blocks_per_second']:.0f} blocks/s)")
+            except Exception as e:
+                print(f"⚠️ Chain sync failed: {e}")
+            self._stop_event.wait(interval)
+
+    def start(self, interval: float = 5.0):
+        """Sync in the background every ``interval`` seconds"""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name='chain-sync', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+
+def start_replication(blockchain: SmartMineBlockchain):
+    """Start the peer server and background sync configured for this node
+
+    Returns ``(server, syncer)``; either is None if not configured.
+    """
+    server = None
+    if config.BLOCKCHAIN_PEER_PORT:
+        server = PeerServer(blockchain, config.BLOCKCHAIN_PEER_HOST, config.BLOCKCHAIN_PEER_PORT)
+        server.start()
+    syncer = None
+    peers = [url.strip() for url in config.BLOCKCHAIN_PEERS.split(',') if url.strip()]
+    if peers:
+        syncer = ChainSyncer(blockchain, peers, fetch_workers=config.BLOCKCHAIN_SYNC_WORKERS)
+        syncer.start(config.BLOCKCHAIN_SYNC_INTERVAL)
+    return server, syncer
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a SmartMine ledger node')
+    parser.add_argument('--host', default=config.BLOCKCHAIN_PEER_HOST)
+    parser.add_argument('--port', type=int, default=config.BLOCKCHAIN_PEER_PORT or 8770)
+    parser.add_argument('--peers', default=config.BLOCKCHAIN_PEERS, help='comma-separated peer URLs')
+    parser.add_argument('--interval', type=float, default=config.BLOCKCHAIN_SYNC_INTERVAL)
+    args = parser.parse_args()
+
+    server = PeerServer(smartmine_blockchain, args.host, args.port)
+    server.start()
+    peers = [url.strip() for url in args.peers.split(',') if url.strip()]
+    syncer = ChainSyncer(smartmine_blockchain, peers, fetch_workers=config.BLOCKCHAIN_SYNC_WORKERS)
+    if peers:
+        syncer.start(args.interval)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        syncer.stop()
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
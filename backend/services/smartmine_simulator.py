@@ -9,30 +9,68 @@ import websockets
 from threading import Thread
 import uuid
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import parse_qs, urlparse
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
 import config
+from services.fleet_engine import FleetEngine
+from services.mempool import MempoolFullError
+from services.stream_fanout import StreamFanout
+from services.stream_protocol import DeltaStream
 
 class SmartMineDigitalTwin:
-    def __init__(self, base_data_path=None):
-        """Initialize the SmartMine digital twin simulator"""
+    def __init__(self, base_data_path=None, blockchain=None, engine=None, num_trucks=None):
+        """Initialize the SmartMine digital twin simulator
+        
+        If a blockchain is given, every truck dump is recorded on it as a
+        supply chain shipment and sealed in the background (see
+        create_digital_twin for the configured setup).
+        Dumps that find the blockchain's mempool full are counted in
+        ``dropped_dumps`` rather than waited on.
+        
+        ``engine`` is 'dict' (one dict per entity) or 'vectorized' (NumPy
+        arrays, for fleets of thousands); defaults to SIMULATION_ENGINE.
+        With the vectorized engine trucks, crushers and stockpiles are
+        read-only dict views.
+        """
         if base_data_path is None:
             base_data_path = config.DATASET_FILE
+        if engine is None:
+            engine = config.SIMULATION_ENGINE
+        if num_trucks is None:
+            num_trucks = config.MAX_TRUCKS
         self.df = pd.read_csv(base_data_path)
         self.df['Datetime'] = pd.to_datetime(self.df['Datetime'])
         
         # Mining-specific state variables
-        self.trucks = self.initialize_truck_fleet()
-        self.crushers = self.initialize_crushers()
-        self.stockpiles = self.initialize_stockpiles()
+        if engine == 'vectorized':
+            self.fleet = FleetEngine(num_trucks, config.MAX_CRUSHERS)
+            self.trucks = self.fleet.trucks
+            self.crushers = self.fleet.crushers
+            self.stockpiles = self.fleet.stockpiles
+        else:
+            self.fleet = None
+            self.trucks = self.initialize_truck_fleet(num_trucks)
+            self.crushers = self.initialize_crushers()
+            self.stockpiles = self.initialize_stockpiles()
+            # Destination index: stockpile -> ids of trucks dumping there
+            self.dumping_trucks = self.index_dumping_trucks()
         self.mine_zones = self.initialize_mine_zones()
         
         # Simulation parameters
         self.simulation_speed = 1.0
-        self.connected_clients = set()
+        # Connected clients, each with its own bounded send queue
+        self.fanout = StreamFanout(config.STREAM_CLIENT_QUEUE_SIZE, config.STREAM_SLOW_CLIENT_POLICY)
+        self.stream = DeltaStream(config.STREAM_KEYFRAME_INTERVAL)
+        self.blockchain = blockchain
+        self._sealer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='dump-sealer') if blockchain is not None else None
+        self._seal_future = None
+        # Dumps not recorded because the blockchain's mempool was full
+        self.dropped_dumps = 0
         
         # Mining operations metrics
         self.daily_throughput = 0
@@ -40,10 +78,10 @@ class SmartMineDigitalTwin:
         self.crusher_efficiency = {}
         self.stockpile_levels = {}
         
-    def initialize_truck_fleet(self):
+    def initialize_truck_fleet(self, num_trucks=15):
         """Initialize truck fleet with GPS and load sensors"""
         trucks = {}
-        for i in range(1, 16):  # 15 trucks
+        for i in range(1, num_trucks + 1):
             trucks[f"TRUCK_{i:03d}"] = {
                 'id': f"TRUCK_{i:03d}",
                 'status': random.choice(['loading', 'hauling', 'dumping', 'idle', 'maintenance']),
@@ -110,6 +148,14 @@ class SmartMineDigitalTwin:
             }
         return stockpiles
     
+    def index_dumping_trucks(self):
+        """Build the index of dumping trucks by destination stockpile"""
+        index = {stockpile_id: set() for stockpile_id in self.stockpiles}
+        for truck_id, truck in self.trucks.items():
+            if truck['status'] == 'dumping' and truck['destination'] in index:
+                index[truck['destination']].add(truck_id)
+        return index
+    
     def initialize_mine_zones(self):
         """Initialize mining zones with production targets"""
         zones = {}
@@ -131,6 +177,13 @@ class SmartMineDigitalTwin:
     
     def update_truck_operations(self):
         """Update truck positions and operations"""
+        if self.fleet is not None:
+            arrived = self.fleet.step_trucks()
+            if self.blockchain is not None:
+                for truck_id in (self.trucks.ids[position] for position in arrived.tolist()):
+                    self.record_truck_dump(self.trucks[truck_id])
+            return
+        
         for truck_id, truck in self.trucks.items():
             # Update truck position and status
             if truck['status'] == 'hauling':
@@ -145,6 +198,9 @@ class SmartMineDigitalTwin:
                 # Chance to complete haul
                 if random.random() < 0.1:
                     truck['status'] = 'dumping'
+                    if truck['destination'] in self.dumping_trucks:
+                        self.dumping_trucks[truck['destination']].add(truck_id)
+                    self.record_truck_dump(truck)
                     
             elif truck['status'] == 'loading':
                 # Loading operation
@@ -165,6 +221,8 @@ class SmartMineDigitalTwin:
                         self.stockpiles[truck['destination']]['current_volume'] += dump_amount
                 else:
                     truck['status'] = 'idle'
+                    if truck['destination'] in self.dumping_trucks:
+                        self.dumping_trucks[truck['destination']].discard(truck_id)
                     truck['destination'] = None
                     
             elif truck['status'] == 'idle':
@@ -180,8 +238,51 @@ class SmartMineDigitalTwin:
             truck['health_score'] -= random.uniform(0, 0.1)
             truck['health_score'] = max(50, truck['health_score'])
     
+    def record_truck_dump(self, truck):
+        """Record a truck dump on the blockchain as a material shipment
+        
+        Runs on the event loop, so it never waits for mempool room: when the
+        mempool is full the dump is dropped and counted instead.
+        """
+        if self.blockchain is None or not truck['destination']:
+            return
+        stockpile = self.stockpiles.get(truck['destination'], {})
+        try:
+            self.blockchain.track_material_shipment({
+                'material_type': stockpile.get('material_type', 'ore'),
+                'quantity': truck['current_load'],
+                'source': 'pit',
+                'destination': truck['destination'],
+                'truck_id': truck['id']
+            }, wait=False)
+        except MempoolFullError:
+            self.dropped_dumps += 1
+    
+    def seal_recorded_dumps(self):
+        """Seal recorded dumps on a worker thread so the simulation never waits on mining
+        
+        Works with or without an event loop (the API drives the simulator
+        from request threads). A blockchain with a mempool seals by itself.
+        """
+        if self.blockchain is None or not self.blockchain.pending_transactions:
+            return
+        if self._seal_future is not None and not self._seal_future.done():
+            # Dumps recorded meanwhile go into the next block
+            return
+        self._seal_future = self._sealer.submit(self.blockchain.seal_pending)
+        self._seal_future.add_done_callback(self._on_dumps_sealed)
+    
+    @staticmethod
+    def _on_dumps_sealed(future):
+        if future.exception() is not None:
+            print(f"⚠️ Failed to seal truck dumps: {future.exception()}")
+    
     def update_crusher_operations(self):
         """Update crusher operations and performance"""
+        if self.fleet is not None:
+            self.fleet.step_crushers()
+            return
+        
         for crusher_id, crusher in self.crushers.items():
             if crusher['status'] == 'running':
                 # Update throughput
@@ -216,21 +317,26 @@ class SmartMineDigitalTwin:
     
     def update_stockpile_levels(self):
         """Update stockpile inventory levels"""
+        if self.fleet is not None:
+            self.fleet.step_stockpiles()
+            return
+        
+        # O(stockpiles + dumping trucks): trucks come from the destination index
+        running_crushers = sum(1 for crusher in self.crushers.values() if crusher['status'] == 'running')
+        
         for stockpile_id, stockpile in self.stockpiles.items():
             # Calculate fill/discharge rates based on operations
             fill_rate = 0
             discharge_rate = 0
             
             # Add material from trucks
-            for truck in self.trucks.values():
-                if truck['destination'] == stockpile_id and truck['status'] == 'dumping':
-                    fill_rate += random.uniform(50, 100)
+            for _ in self.dumping_trucks[stockpile_id]:
+                fill_rate += random.uniform(50, 100)
             
             # Remove material to crushers
             if 'ROM' in stockpile_id or 'Crushed' in stockpile_id:
-                for crusher in self.crushers.values():
-                    if crusher['status'] == 'running':
-                        discharge_rate += random.uniform(30, 80)
+                for _ in range(running_crushers):
+                    discharge_rate += random.uniform(30, 80)
             
             stockpile['fill_rate'] = fill_rate
             stockpile['discharge_rate'] = discharge_rate
@@ -244,8 +350,11 @@ class SmartMineDigitalTwin:
     def calculate_kpis(self):
         """Calculate key performance indicators"""
         # Truck utilization
-        active_trucks = sum(1 for truck in self.trucks.values() 
-                          if truck['status'] in ['loading', 'hauling', 'dumping'])
+        if self.fleet is not None:
+            active_trucks = self.fleet.count_trucks('loading', 'hauling', 'dumping')
+        else:
+            active_trucks = sum(1 for truck in self.trucks.values() 
+                              if truck['status'] in ['loading', 'hauling', 'dumping'])
         truck_utilization = (active_trucks / len(self.trucks)) * 100
         
         # Crusher availability
@@ -273,40 +382,59 @@ class SmartMineDigitalTwin:
             }
         }
     
-    def generate_mining_data(self):
-        """Generate comprehensive mining operation data"""
+    def generate_mining_data(self, selection=None):
+        """Generate comprehensive mining operation data
+        
+        ``selection`` ({section: equipment ids, or None for all}; see
+        stream_protocol.topic_selection) limits the packet to the sections
+        streaming clients subscribed to. The simulation always advances;
+        only unused sections are skipped.
+        """
         # Update all systems
         self.update_truck_operations()
         self.update_crusher_operations()
         self.update_stockpile_levels()
+        self.seal_recorded_dumps()
         
-        # Calculate KPIs
-        kpis = self.calculate_kpis()
-        
-        # Generate comprehensive data packet
-        mining_data = {
-            'timestamp': datetime.now().isoformat(),
-            'mine_id': 'SMARTMINE_001',
-            'trucks': self.trucks,
-            'crushers': self.crushers,
-            'stockpiles': self.stockpiles,
-            'mine_zones': self.mine_zones,
-            'kpis': kpis,
-            'weather': {
+        equipment = {'trucks': self.trucks, 'crushers': self.crushers, 'stockpiles': self.stockpiles}
+        sections = {
+            'trucks': lambda: self.trucks.to_dict() if self.fleet is not None else self.trucks,
+            'crushers': lambda: self.crushers.to_dict() if self.fleet is not None else self.crushers,
+            'stockpiles': lambda: self.stockpiles.to_dict() if self.fleet is not None else self.stockpiles,
+            'mine_zones': lambda: self.mine_zones,
+            'kpis': self.calculate_kpis,
+            'weather': lambda: {
                 'temperature': random.uniform(15, 35),
                 'humidity': random.uniform(20, 80),
                 'wind_speed': random.uniform(0, 25),
                 'visibility': random.uniform(5, 15)
             },
-            'shift_info': {
+            'shift_info': lambda: {
                 'current_shift': 'Day' if 6 <= datetime.now().hour < 18 else 'Night',
                 'shift_start': datetime.now().replace(hour=6, minute=0).isoformat(),
                 'crew_count': random.randint(25, 45)
             },
-            'alerts': self.generate_alerts(),
-            'ai_recommendations': self.generate_ai_recommendations()
+            'alerts': self.generate_alerts,
+            'ai_recommendations': self.generate_ai_recommendations
         }
         
+        # Generate comprehensive data packet
+        mining_data = {
+            'timestamp': datetime.now().isoformat(),
+            'mine_id': 'SMARTMINE_001'
+        }
+        for section, build in sections.items():
+            if selection is not None and section not in selection:
+                continue
+            equipment_ids = None if selection is None else selection[section]
+            if equipment_ids is None:
+                mining_data[section] = build()
+            else:
+                # Only the subscribed equipment
+                mining_data[section] = {equipment_id: equipment[section][equipment_id]
+                                        for equipment_id in sorted(equipment_ids)
+                                        if equipment_id in equipment[section]}
+        
         return mining_data
     
     def generate_alerts(self):
@@ -314,7 +442,14 @@ class SmartMineDigitalTwin:
         alerts = []
         
         # Truck alerts
-        for truck_id, truck in self.trucks.items():
+        if self.fleet is not None:
+            # Only build views for the trucks that will raise an alert
+            arrays = self.fleet.trucks
+            trucks = arrays.items_where((arrays.fuel_level < 20) | (arrays.health_score < 70))
+        else:
+            trucks = self.trucks.items()
+        
+        for truck_id, truck in trucks:
             if truck['fuel_level'] < 20:
                 alerts.append({
                     'id': str(uuid.uuid4()),
@@ -365,13 +500,16 @@ class SmartMineDigitalTwin:
         recommendations = []
         
         # Truck dispatch optimization
-        idle_trucks = [t for t in self.trucks.values() if t['status'] == 'idle']
-        if len(idle_trucks) > 3:
+        if self.fleet is not None:
+            idle_trucks = self.fleet.count_trucks('idle')
+        else:
+            idle_trucks = sum(1 for t in self.trucks.values() if t['status'] == 'idle')
+        if idle_trucks > 3:
             recommendations.append({
                 'type': 'truck_dispatch',
                 'priority': 'medium',
                 'title': 'Optimize Truck Allocation',
-                'description': f'{len(idle_trucks)} trucks are idle. Consider redistributing to active zones.',
+                'description': f'{idle_trucks} trucks are idle. Consider redistributing to active zones.',
                 'estimated_impact': 'Increase throughput by 12-18%'
             })
         
@@ -402,37 +540,89 @@ class SmartMineDigitalTwin:
         return recommendations
     
     async def websocket_handler(self, websocket):
-        """Handle WebSocket connections for SmartMine data streaming"""
-        self.connected_clients.add(websocket)
-        print(f"SmartMine client connected. Total clients: {len(self.connected_clients)}")
+        """Handle WebSocket connections for SmartMine data streaming
+        
+        Clients connecting with ``?protocol=delta`` get a keyframe followed
+        by delta frames (see stream_protocol); others get full snapshots.
+        Clients get only the topics they subscribe to, either with
+        ``?topics=trucks,kpis`` or by sending subscribe/unsubscribe messages.
+        """
+        query = parse_qs(urlparse(websocket.path).query)
+        protocol = 'delta' if query.get('protocol') == ['delta'] else 'full'
+        self.fanout.add_client(websocket, protocol)
+        print(f"SmartMine client connected ({protocol}). Total clients: {len(self.fanout)}")
         
         try:
-            await websocket.wait_closed()
+            if 'topics' in query:
+                topics = [topic for value in query['topics'] for topic in value.split(',') if topic]
+                await websocket.send(json.dumps(self.handle_client_message(
+                    websocket, {'action': 'subscribe', 'topics': topics})))
+            async for message in websocket:
+                await websocket.send(json.dumps(self.handle_client_message(websocket, message)))
+        except websockets.exceptions.ConnectionClosed:
+            pass
         finally:
-            self.connected_clients.remove(websocket)
-            print(f"SmartMine client disconnected. Total clients: {len(self.connected_clients)}")
+            self.fanout.remove_client(websocket)
+            print(f"SmartMine client disconnected. Total clients: {len(self.fanout)}")
+    
+    def handle_client_message(self, websocket, message):
+        """Apply a subscription request from a streaming client
+        
+        Requests look like ``{"action": "subscribe", "topics": ["trucks",
+        "crushers/CRUSHER_1"]}`` (or "unsubscribe"); the reply lists the
+        client's topics, or reports the error (including malformed topics
+        and clients the fan-out has already disconnected).
+        """
+        try:
+            request = json.loads(message) if isinstance(message, (str, bytes)) else message
+            if not isinstance(request, dict):
+                raise ValueError("Expected a JSON object")
+            topics = request.get('topics', [])
+            if isinstance(topics, str):
+                topics = [topics]
+            if not isinstance(topics, list):
+                raise ValueError("Expected 'topics' to be a list of topic strings")
+            
+            action = request.get('action')
+            if action == 'subscribe':
+                subscribed = self.fanout.subscribe(websocket, topics)
+            elif action == 'unsubscribe':
+                subscribed = self.fanout.unsubscribe(websocket, topics)
+            else:
+                raise ValueError(f"Unknown action '{action}' (expected subscribe or unsubscribe)")
+            return {'type': 'subscribed', 'topics': subscribed}
+        except ValueError as e:
+            return {'type': 'error', 'message': str(e)}
     
     async def broadcast_mining_data(self):
-        """Broadcast real-time mining data to all connected clients"""
+        """Broadcast real-time mining data to all connected clients
+        
+        Each tick is serialized once and queued for every client; per-client
+        sender tasks do the writing, so a slow client never delays the rest.
+        """
         while True:
-            if self.connected_clients:
-                data = self.generate_mining_data()
-                message = json.dumps(data, default=str)
-                
-                # Send to all connected clients
-                disconnected = set()
-                for client in self.connected_clients:
-                    try:
-                        await client.send(message)
-                    except websockets.exceptions.ConnectionClosed:
-                        disconnected.add(client)
-                
-                # Remove disconnected clients
-                self.connected_clients -= disconnected
+            if self.fanout:
+                # Only build the sections subscribed clients need
+                data = self.generate_mining_data(self.fanout.selection())
+                # Diff against the previous tick only while someone streams deltas
+                frame = self.stream.next_frame(data, track=self.fanout.has_protocol('delta'))
+                self.fanout.publish(frame)
             
             # Wait based on simulation speed
             await asyncio.sleep(5.0 / self.simulation_speed)  # Update every 5 seconds
     
+    def stream_compression(self):
+        """permessage-deflate setting for the WebSocket server
+        
+        Deflate compresses every message once per connection; with 'none'
+        each frame is serialized once and sent as-is to every client.
+        """
+        return None if config.STREAM_COMPRESSION == 'none' else config.STREAM_COMPRESSION
+    
+    def get_stream_metrics(self):
+        """Client queue depth, drop and publish latency metrics for the stream"""
+        return self.fanout.get_metrics()
+    
     def start_smartmine_simulation(self, host='localhost', port=8766):
         """Start the SmartMine digital twin simulation"""
         print(f"Starting SmartMine Digital Twin on ws://{host}:{port}")
@@ -443,7 +633,8 @@ class SmartMineDigitalTwin:
         print("- Unified Operations Dashboard data")
         
         # Start WebSocket server
-        start_server = websockets.serve(self.websocket_handler, host, port)
+        start_server = websockets.serve(self.websocket_handler, host, port,
+                                        compression=self.stream_compression())
         
         # Start data broadcasting
         async def run_simulation():
@@ -469,7 +660,8 @@ class SmartMineDigitalTwin:
         print("- Data streaming interval: 5 seconds")
         
         # Start WebSocket server
-        start_server = websockets.serve(self.websocket_handler, host, port)
+        start_server = websockets.serve(self.websocket_handler, host, port,
+                                        compression=self.stream_compression())
         
         # Start both server and data broadcasting
         await asyncio.gather(
@@ -477,6 +669,14 @@ class SmartMineDigitalTwin:
             self.broadcast_mining_data()
         )
 
+def create_digital_twin() -> SmartMineDigitalTwin:
+    """Create the simulator, recording truck dumps on the shared blockchain if SIMULATION_RECORD_DUMPS"""
+    blockchain = None
+    if config.SIMULATION_RECORD_DUMPS:
+        # Imported here: the shared blockchain opens its block store on import
+        from services.blockchain_service import smartmine_blockchain as blockchain
+    return SmartMineDigitalTwin(blockchain=blockchain)
+
 if __name__ == "__main__":
-    smartmine = SmartMineDigitalTwin()
+    smartmine = create_digital_twin()
     smartmine.start_smartmine_simulation()
@@ -0,0 +1,177 @@
+"""
+📣 SMARTMINE STREAM FAN-OUT
+Concurrent delivery of simulator frames to WebSocket clients
+- Each frame is serialized once and shared by every client
+- Every client has a bounded send queue drained by its own task, so a
+  slow link only ever delays itself
+- Full queues either drop the oldest frame (delta clients restart from a
+  keyframe) or disconnect the client
+- Per-client topic subscriptions; clients on the same topics share
+  one message
+- Queue depth, drop and disconnect metrics
+"""
+
+import asyncio
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+import websockets
+
+from services.stream_protocol import TOPICS, Frame, parse_topic, topic_selection
+
+FULL_POLICIES = ('drop_oldest', 'disconnect')
+
+
+class ClientSession:
+    """One connected client: protocol, topics, bounded send queue and sender task"""
+
+    def __init__(self, websocket, protocol: str, queue_size: int):
+        self.websocket = websocket
+        self.protocol = protocol
+        self.topics = None  # None: the whole payload
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.needs_keyframe = protocol == 'delta'
+        self.task = None
+        self.sent = 0
+        self.dropped = 0
+
+
+class StreamFanout:
+    """Publishes frames to every client without waiting on any of them"""
+
+    def __init__(self, queue_size: int = 8, full_policy: str = 'drop_oldest'):
+        if full_policy not in FULL_POLICIES:
+            raise ValueError(f"Unknown full policy '{full_policy}' (expected one of {', '.join(FULL_POLICIES)})")
+        self.queue_size = max(1, queue_size)
+        self.full_policy = full_policy
+        self.sessions: Dict[object, ClientSession] = {}
+
+        # Metrics
+        self.frames_published = 0
+        self.messages_dropped = 0
+        self.clients_disconnected = 0
+        self.last_publish_ms = 0.0
+        self.max_publish_ms = 0.0
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def has_protocol(self, protocol: str) -> bool:
+        return any(session.protocol == protocol for session in self.sessions.values())
+
+    def add_client(self, websocket, protocol: str = 'full') -> ClientSession:
+        """Register a client and start its sender task (call from the event loop)"""
+        session = ClientSession(websocket, protocol, self.queue_size)
+        session.task = asyncio.get_running_loop().create_task(self._drain(session))
+        self.sessions[websocket] = session
+        return session
+
+    def subscribe(self, websocket, topics: Iterable[str]) -> List[str]:
+        """Add topics to a client's subscription; returns its topics"""
+        session = self._session(websocket)
+        topics = self._validate(topics)
+        return self._set_topics(session, topics | (session.topics or set()))
+
+    def unsubscribe(self, websocket, topics: Iterable[str]) -> List[str]:
+        """Remove topics from a client's subscription; returns its topics"""
+        session = self._session(websocket)
+        current = set(TOPICS) if session.topics is None else session.topics
+        return self._set_topics(session, current - self._validate(topics))
+
+    def _session(self, websocket) -> ClientSession:
+        """Get a client's session; ValueError if it was disconnected (e.g. for being too slow)"""
+        session = self.sessions.get(websocket)
+        if session is None:
+            raise ValueError("Client is disconnected")
+        return session
+
+    @staticmethod
+    def _validate(topics: Iterable[str]) -> Set[str]:
+        """Check every topic before building a set of them; ValueError for bad ones"""
+        topics = list(topics)
+        for topic in topics:
+            parse_topic(topic)
+        return set(topics)
+
+    def _set_topics(self, session: ClientSession, topics: Set[str]) -> List[str]:
+        session.topics = frozenset(topics)
+        # The client's state lacks newly subscribed sections: restart deltas from a keyframe
+        session.needs_keyframe = session.protocol == 'delta'
+        return sorted(session.topics)
+
+    def selection(self) -> Optional[Dict[str, Optional[Set[str]]]]:
+        """Payload sections (and equipment) at least one client needs; None for everything"""
+        return topic_selection(session.topics for session in self.sessions.values())
+
+    def remove_client(self, websocket):
+        session = self.sessions.pop(websocket, None)
+        if session is not None:
+            session.task.cancel()
+
+    def publish(self, frame: Frame):
+        """Queue a frame for every client; never blocks"""
+        start = time.perf_counter()
+        for session in list(self.sessions.values()):
+            if session.topics is not None and not session.topics:
+                continue
+            message = frame.message_for(session.protocol, session.needs_keyframe, session.topics)
+            session.needs_keyframe = False
+            self._enqueue(session, frame, message)
+        self.frames_published += 1
+        self.last_publish_ms = (time.perf_counter() - start) * 1000
+        self.max_publish_ms = max(self.max_publish_ms, self.last_publish_ms)
+
+    def _enqueue(self, session: ClientSession, frame: Frame, message: str):
+        queue = session.queue
+        if queue.full():
+            if self.full_policy == 'disconnect':
+                self._disconnect(session)
+                return
+            if session.protocol == 'delta':
+                # Later deltas are useless after a gap: restart from this frame's keyframe
+                dropped = queue.qsize()
+                while not queue.empty():
+                    queue.get_nowait()
+                message = frame.message_for('delta', True, session.topics)
+            else:
+                queue.get_nowait()
+                dropped = 1
+            session.dropped += dropped
+            self.messages_dropped += dropped
+        queue.put_nowait(message)
+
+    def _disconnect(self, session: ClientSession):
+        """Drop a client that fell a full queue behind"""
+        self.remove_client(session.websocket)
+        self.clients_disconnected += 1
+        # 1008: policy violation; closing may itself wait on the slow link
+        asyncio.get_running_loop().create_task(session.websocket.close(code=1008, reason='Client too slow'))
+
+    async def _drain(self, session: ClientSession):
+        try:
+            while True:
+                message = await session.queue.get()
+                await session.websocket.send(message)
+                session.sent += 1
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            if self.sessions.get(session.websocket) is session:
+                del self.sessions[session.websocket]
+
+    def get_metrics(self) -> Dict:
+        depths = [session.queue.qsize() for session in self.sessions.values()]
+        return {
+            'clients': len(self.sessions),
+            'queue_size': self.queue_size,
+            'full_policy': self.full_policy,
+            'frames_published': self.frames_published,
+            'messages_dropped': self.messages_dropped,
+            'clients_disconnected': self.clients_disconnected,
+            'max_queue_depth': max(depths, default=0),
+            'mean_queue_depth': sum(depths) / len(depths) if depths else 0,
+            'lagging_clients': sum(1 for depth in depths if depth > 1),
+            'subscribed_clients': sum(1 for session in self.sessions.values() if session.topics is not None),
+            'last_publish_ms': self.last_publish_ms,
+            'max_publish_ms': self.max_publish_ms
+        }
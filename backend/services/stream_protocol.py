@@ -0,0 +1,227 @@
+"""
+📡 SMARTMINE STREAM PROTOCOL
+Delta-encoded frames for the simulator WebSocket stream
+- Full snapshots (the original payload) for clients that did not opt in
+- Delta clients get a keyframe on connect and every N ticks, and in
+  between only the fields that changed
+- Every frame carries a sequence number; a delta applies only on top of
+  the frame numbered ``base_seq``
+
+Frames for delta clients::
+
+    {"type": "keyframe", "seq": 41, "data": {...full payload...}}
+    {"type": "delta", "seq": 42, "base_seq": 41,
+     "changes": {"trucks": {"TRUCK_001": {"fuel_level": 61.2}}},
+     "removed": [["trucks", "TRUCK_009"]]}
+
+To apply a delta, merge ``changes`` into the state (objects merge
+recursively, anything else replaces the old value), then delete each
+``removed`` key path. A client that sees a gap in ``seq`` should wait for
+the next keyframe.
+
+Clients may also subscribe to topics, payload sections (``trucks``,
+``kpis``, ``alerts``...) or single equipment (``crushers/CRUSHER_1``),
+and then get only those sections plus ``timestamp`` and ``mine_id``, in
+either protocol. Clients that never subscribe get everything.
+"""
+
+import json
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# Payload sections clients can subscribe to; equipment sections also take ``<section>/<id>``
+TOPICS = ('trucks', 'crushers', 'stockpiles', 'mine_zones', 'kpis', 'weather',
+          'shift_info', 'alerts', 'ai_recommendations')
+EQUIPMENT_TOPICS = ('trucks', 'crushers', 'stockpiles')
+ENVELOPE_FIELDS = ('timestamp', 'mine_id')
+
+
+def diff_state(old: Dict, new: Dict, path: Tuple = ()) -> Tuple[Dict, List[List]]:
+    """Get ``(changes, removed)`` turning ``old`` into ``new``"""
+    changes = {}
+    removed = [list(path + (key,)) for key in old if key not in new]
+    for key, value in new.items():
+        if key not in old:
+            changes[key] = value
+            continue
+        previous = old[key]
+        if isinstance(value, dict) and isinstance(previous, dict):
+            nested, nested_removed = diff_state(previous, value, path + (key,))
+            if nested:
+                changes[key] = nested
+            removed.extend(nested_removed)
+        elif value != previous:
+            changes[key] = value
+    return changes, removed
+
+
+def _merge(state: Dict, changes: Dict):
+    for key, value in changes.items():
+        if isinstance(value, dict) and isinstance(state.get(key), dict):
+            _merge(state[key], value)
+        else:
+            state[key] = value
+
+
+def apply_delta(state: Dict, frame: Dict) -> Dict:
+    """Apply a delta frame to the state it was based on (reference client logic)"""
+    _merge(state, frame['changes'])
+    for path in frame['removed']:
+        parent = state
+        for key in path[:-1]:
+            parent = parent[key]
+        parent.pop(path[-1], None)
+    return state
+
+
+def parse_topic(topic: str) -> Tuple[str, Optional[str]]:
+    """Split a topic into ``(section, equipment_id or None)``"""
+    if not isinstance(topic, str):
+        raise ValueError(f"Topics must be strings, got {topic!r}")
+    section, _, equipment_id = topic.partition('/')
+    if section not in TOPICS or (equipment_id and section not in EQUIPMENT_TOPICS):
+        raise ValueError(f"Unknown topic '{topic}'")
+    return section, equipment_id or None
+
+
+def topic_selection(topic_sets: Iterable[Optional[FrozenSet[str]]]) -> Optional[Dict[str, Optional[Set[str]]]]:
+    """Merge clients' topics into ``{section: equipment ids, or None for all}``
+
+    Returns None (the whole payload) if any client is not subscribed to
+    specific topics.
+    """
+    selection = {}
+    for topics in topic_sets:
+        if topics is None:
+            return None
+        for topic in topics:
+            section, equipment_id = parse_topic(topic)
+            if equipment_id is None:
+                selection[section] = None
+            elif section not in selection:
+                selection[section] = {equipment_id}
+            elif selection[section] is not None:
+                selection[section].add(equipment_id)
+    return selection
+
+
+def select_sections(data: Dict, selection: Dict[str, Optional[Set[str]]]) -> Dict:
+    """The selected sections of a payload (or of delta changes), plus envelope fields"""
+    selected = {key: data[key] for key in ENVELOPE_FIELDS if key in data}
+    for section, value in data.items():
+        if section not in selection:
+            continue
+        equipment_ids = selection[section]
+        if equipment_ids is None:
+            selected[section] = value
+        else:
+            selected[section] = {equipment_id: value[equipment_id]
+                                 for equipment_id in sorted(equipment_ids) if equipment_id in value}
+    return selected
+
+
+def _path_selected(path: List, selection: Dict[str, Optional[Set[str]]]) -> bool:
+    section = path[0]
+    if section in ENVELOPE_FIELDS:
+        return True
+    if section not in selection:
+        return False
+    equipment_ids = selection[section]
+    return equipment_ids is None or len(path) == 1 or path[1] in equipment_ids
+
+
+class Frame:
+    """One tick of the stream; messages are serialized on first use and shared by all clients"""
+
+    def __init__(self, seq: int, snapshot: str, is_keyframe: bool, delta: Optional[Tuple] = None,
+                 data: Optional[Dict] = None):
+        self.seq = seq
+        self.snapshot = snapshot
+        self.is_keyframe = is_keyframe
+        self.data = data  # what the snapshot was serialized from, for topic-filtered messages
+        self._delta = delta
+        self._keyframe_message = None
+        self._delta_message = None
+        self._topic_messages = {}
+
+    @property
+    def keyframe_message(self) -> str:
+        if self._keyframe_message is None:
+            # Splice the already-serialized snapshot instead of encoding it again
+            self._keyframe_message = f'{{"type": "keyframe", "seq": {self.seq}, "data": {self.snapshot}}}'
+        return self._keyframe_message
+
+    @property
+    def delta_message(self) -> str:
+        if self._delta_message is None:
+            changes, removed = self._delta
+            self._delta_message = json.dumps({
+                'type': 'delta',
+                'seq': self.seq,
+                'base_seq': self.seq - 1,
+                'changes': changes,
+                'removed': removed
+            })
+        return self._delta_message
+
+    def message_for(self, protocol: str, needs_keyframe: bool = False,
+                    topics: Optional[FrozenSet[str]] = None) -> str:
+        """Message for a client speaking ``protocol`` ('full' or 'delta'), limited to ``topics``"""
+        if protocol != 'delta':
+            kind = 'full'
+        elif needs_keyframe or self.is_keyframe:
+            kind = 'keyframe'
+        else:
+            kind = 'delta'
+        if topics is None:
+            if kind == 'full':
+                return self.snapshot
+            return self.keyframe_message if kind == 'keyframe' else self.delta_message
+        # Clients subscribed to the same topics share one message
+        key = (kind, topics)
+        if key not in self._topic_messages:
+            self._topic_messages[key] = self._topic_message(kind, topics)
+        return self._topic_messages[key]
+
+    def _topic_message(self, kind: str, topics: FrozenSet[str]) -> str:
+        selection = topic_selection([topics])
+        if kind == 'delta':
+            changes, removed = self._delta
+            return json.dumps({
+                'type': 'delta',
+                'seq': self.seq,
+                'base_seq': self.seq - 1,
+                'changes': {key: value for key, value in select_sections(changes, selection).items() if value != {}},
+                'removed': [path for path in removed if _path_selected(path, selection)]
+            })
+        if kind == 'keyframe':
+            snapshot = self.message_for('full', topics=topics)
+            return f'{{"type": "keyframe", "seq": {self.seq}, "data": {snapshot}}}'
+        return json.dumps(select_sections(self.data, selection), default=str)
+
+
+class DeltaStream:
+    """Numbers ticks and diffs each payload against the previous one"""
+
+    def __init__(self, keyframe_interval: int = 20):
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.seq = 0
+        self._previous = None
+
+    def next_frame(self, data: Dict, track: bool = True) -> Frame:
+        """Serialize the payload for this tick
+
+        With ``track`` False (no delta clients connected) no diff is computed
+        and the next tracked frame is a keyframe.
+        """
+        snapshot = json.dumps(data, default=str)
+        self.seq += 1
+        if not track:
+            self._previous = None
+            return Frame(self.seq, snapshot, True, data=data)
+
+        # Diff what clients decode, not the live (mutable) simulator objects
+        current = json.loads(snapshot)
+        is_keyframe = self._previous is None or self.seq % self.keyframe_interval == 0
+        delta = None if is_keyframe else diff_state(self._previous, current)
+        self._previous = current
+        return Frame(self.seq, snapshot, is_keyframe, delta, current)
@@ -0,0 +1,184 @@
+"""
+✍️ SMARTMINE TRANSACTION SIGNING
+Ed25519 proof of origin for ledger transactions
+- Operators sign the canonical JSON of a transaction (everything but the
+  signature) and attach their public key
+- Batch verification split across a process pool
+- LRU cache of verified transactions so a block never re-checks what the
+  mempool already verified
+
+Like parallel_miner, this module has no dependency on the blockchain
+service so worker processes can import it cheaply.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+
+# Batches smaller than this are verified in-process; the pool round trip costs more
+MIN_PARALLEL_BATCH = 64
+
+
+def _as_dict(transaction) -> Dict:
+    return transaction if isinstance(transaction, dict) else transaction.to_dict()
+
+
+def signing_payload(transaction) -> bytes:
+    """Canonical bytes a transaction signature covers (all fields but the signature)"""
+    data = {key: value for key, value in _as_dict(transaction).items() if key != 'signature'}
+    return json.dumps(data, sort_keys=True).encode()
+
+
+def is_signed(transaction) -> bool:
+    return bool(transaction.get('signature')) and bool(transaction.get('public_key'))
+
+
+def _verify_one(payload: bytes, public_key: bytes, signature: bytes) -> bool:
+    try:
+        Ed25519PublicKey.from_public_bytes(public_key).verify(signature, payload)
+    except (InvalidSignature, ValueError):
+        return False
+    return True
+
+
+def verify_chunk(items: Sequence) -> List[bool]:
+    """Verify ``(payload, public_key, signature)`` tuples (runs in pool workers)"""
+    return [_verify_one(*item) for item in items]
+
+
+class TransactionSigner:
+    """Signs transactions with an operator's Ed25519 key"""
+
+    def __init__(self, private_key: Ed25519PrivateKey):
+        self.private_key = private_key
+        self.public_key_hex = private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.Raw,
+            format=serialization.PublicFormat.Raw
+        ).hex()
+
+    def sign(self, transaction: Dict) -> Dict:
+        """Attach the public key and signature to a (fully stamped) transaction dict"""
+        transaction['public_key'] = self.public_key_hex
+        transaction['signature'] = self.private_key.sign(signing_payload(transaction)).hex()
+        return transaction
+
+
+class SignatureVerifier:
+    """Batch transaction signature verification with a verified-transaction cache
+
+    Cache keys are digests of the whole signed transaction, so a tampered
+    transaction never matches a cached entry.
+    """
+
+    def __init__(self, workers: Optional[int] = None, cache_size: int = 100000,
+                 require_signatures: bool = False):
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_size = cache_size
+        self.require_signatures = require_signatures
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = None
+
+        # Metrics
+        self.verified = 0
+        self.failed = 0
+        self.cache_hits = 0
+        self.verify_seconds = 0.0
+
+    @staticmethod
+    def _cache_key(transaction) -> bytes:
+        return hashlib.sha256(json.dumps(_as_dict(transaction), sort_keys=True).encode()).digest()
+
+    def _cached(self, key: bytes) -> bool:
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return True
+            return False
+
+    def _remember(self, keys: List[bytes]):
+        with self._lock:
+            for key in keys:
+                self._cache[key] = None
+                self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def verify_batch(self, transactions: Sequence) -> List[bool]:
+        """Check every transaction's signature; returns one flag per transaction
+
+        Unsigned transactions pass unless signatures are required.
+        """
+        results = [True] * len(transactions)
+        pending = []
+        for position, tx in enumerate(transactions):
+            if not is_signed(tx):
+                results[position] = not self.require_signatures
+                continue
+            key = self._cache_key(tx)
+            if self._cached(key):
+                self.cache_hits += 1
+                continue
+            try:
+                item = (signing_payload(tx), bytes.fromhex(tx['public_key']), bytes.fromhex(tx['signature']))
+            except ValueError:
+                results[position] = False
+                continue
+            pending.append((position, key, item))
+
+        if pending:
+            start = time.perf_counter()
+            items = [item for _, _, item in pending]
+            if self.workers > 1 and len(items) >= MIN_PARALLEL_BATCH:
+                size = -(-len(items) // self.workers)
+                chunks = [items[i:i + size] for i in range(0, len(items), size)]
+                flags = [flag for chunk in self._get_executor().map(verify_chunk, chunks) for flag in chunk]
+            else:
+                flags = verify_chunk(items)
+            self.verify_seconds += time.perf_counter() - start
+
+            valid_keys = []
+            for (position, key, _), valid in zip(pending, flags):
+                results[position] = valid
+                if valid:
+                    valid_keys.append(key)
+            self.verified += len(valid_keys)
+            self.failed += len(pending) - len(valid_keys)
+            self._remember(valid_keys)
+
+        return results
+
+    def get_metrics(self) -> Dict:
+        checked = self.verified + self.failed
+        per_second = checked / self.verify_seconds if self.verify_seconds else 0
+        return {
+            'workers': self.workers,
+            'require_signatures': self.require_signatures,
+            'verified': self.verified,
+            'failed': self.failed,
+            'cache_hits': self.cache_hits,
+            'cache_entries': len(self._cache),
+            'verifications_per_second': per_second,
+            'verifications_per_second_per_core': per_second / self.workers
+        }
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None